@@ -158,7 +158,7 @@ async def sync_repository_pulls(
         )
 
     # Split owner and repo name
-    owner, repo_name = repository.full_name.split("/")
+    owner, repo_name = repository.owner_and_repo
 
     try:
         # Fetch PRs from GitHub
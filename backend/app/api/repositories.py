@@ -9,6 +9,7 @@ from app.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.models.repository import Repository
+from app.services.pull_request_service import pull_request_service
 from app.schemas.repository import (
     RepositoryCreate,
     RepositoryUpdate,
@@ -101,6 +102,7 @@ async def create_repository(
     db.add(db_repository)
     db.commit()
     db.refresh(db_repository)
+    pull_request_service.add_known_repository(db_repository.github_id)
 
     return RepositoryResponse.model_validate(db_repository)
 
@@ -220,8 +222,10 @@ async def delete_repository(
             detail="Repository not found",
         )
 
+    github_id = repository.github_id
     db.delete(repository)
     db.commit()
+    pull_request_service.discard_known_repository(github_id)
 
 
 @router.post("/{repository_id}/sync", response_model=RepositoryResponse)
@@ -26,6 +26,8 @@ class Settings(BaseSettings):
     GITHUB_OAUTH_AUTHORIZE_URL: str = "https://github.com/login/oauth/authorize"
     GITHUB_OAUTH_TOKEN_URL: str = "https://github.com/login/oauth/access_token"
     GITHUB_OAUTH_REDIRECT_URI: str = "http://localhost:5173/auth/github/callback"
+    GITHUB_HTTP_MAX_CONNECTIONS: int = 200
+    GITHUB_HTTP_KEEPALIVE: int = 100
 
     # Anthropic Claude API
     ANTHROPIC_API_KEY: str = ""
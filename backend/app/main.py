@@ -8,14 +8,49 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.api import auth, repositories, pull_requests, webhooks, reviews
+from app.database import SessionLocal
+from app.services.github_service import github_service
+from app.services.pull_request_service import pull_request_service
+from app.services.review_service import review_service
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# Configure logging. Importing the app (scripts, alembic, tests) logs
+# directly to stderr; while the server runs, lifespan swaps in a queue so
+# log I/O happens on a listener thread and never blocks the event loop.
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+)
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+log_listener = QueueListener(_log_queue, _log_handler)
+
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))
 
-# Configure logging
 logging.basicConfig(
     level=logging.INFO if settings.ENVIRONMENT == "production" else logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[_log_handler],
 )
 
+
+def _start_queued_logging() -> None:
+    """Route root log records through the queue and start its listener."""
+    log_listener.start()
+    root = logging.getLogger()
+    root.removeHandler(_log_handler)
+    root.addHandler(_queue_handler)
+
+
+def _stop_queued_logging() -> None:
+    """Restore direct logging, then flush the queue and stop the listener."""
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    root.addHandler(_log_handler)
+    log_listener.stop()
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,14 +60,27 @@ async def lifespan(app: FastAPI):
     Lifespan context manager for startup and shutdown events.
     """
     # Startup
+    _start_queued_logging()
     logger.info("Starting AI Code Review Assistant API")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Allowed origins: {settings.allowed_origins_list}")
+    await github_service.startup()
+    await review_service.startup()
+
+    # Cache monitored repository IDs so webhooks for other repos skip the DB
+    try:
+        with SessionLocal() as db:
+            pull_request_service.load_known_repositories(db)
+    except Exception:
+        logger.exception("Could not preload monitored repositories")
 
     yield
 
     # Shutdown
     logger.info("Shutting down AI Code Review Assistant API")
+    await review_service.shutdown()
+    await github_service.shutdown()
+    _stop_queued_logging()
 
 
 # Create FastAPI application
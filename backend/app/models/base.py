@@ -3,13 +3,23 @@ Base model with common fields for all database models.
 """
 
 import uuid as uuid_pkg
-from datetime import datetime
+from datetime import datetime, timezone
 from sqlalchemy import Column, DateTime
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.types import TypeDecorator, CHAR
 from sqlalchemy.dialects.postgresql import UUID
 
 
+def utcnow() -> datetime:
+    """
+    Return the current UTC time for the naive UTC DateTime columns.
+
+    Returns:
+        datetime: Current UTC time without tzinfo
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class GUID(TypeDecorator):
     """
     Platform-independent GUID type.
@@ -53,14 +63,14 @@ class TimestampMixin:
     @declared_attr
     def created_at(cls):
         """Timestamp when the record was created."""
-        return Column(DateTime, default=datetime.utcnow, nullable=False)
+        return Column(DateTime, default=utcnow, nullable=False)
 
     @declared_attr
     def updated_at(cls):
         """Timestamp when the record was last updated."""
         return Column(
             DateTime,
-            default=datetime.utcnow,
-            onupdate=datetime.utcnow,
+            default=utcnow,
+            onupdate=utcnow,
             nullable=False,
         )
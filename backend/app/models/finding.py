@@ -3,11 +3,10 @@ Finding model for storing individual code review findings.
 """
 
 import uuid
-from datetime import datetime
 from sqlalchemy import Column, String, Integer, Text, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 from app.database import Base
-from app.models.base import GUID
+from app.models.base import GUID, utcnow
 
 
 class Finding(Base):
@@ -40,7 +39,7 @@ class Finding(Base):
     tool_source = Column(
         String(100), nullable=True
     )  # bandit, pylint, radon, claude, etc.
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow, nullable=False)
 
     # Relationships
     review = relationship("Review", back_populates="findings")
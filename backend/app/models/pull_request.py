@@ -48,7 +48,8 @@ class PullRequest(Base, TimestampMixin):
         "Review",
         back_populates="pull_request",
         cascade="all, delete-orphan",
-        lazy="dynamic",
+        # Loaded as a list on first access, like User.repositories
+        lazy="select",
     )
 
     def __repr__(self):
@@ -3,6 +3,8 @@ Repository model for storing GitHub repository information.
 """
 
 import uuid
+from functools import cached_property
+from typing import Tuple
 from sqlalchemy import Column, String, Integer, Boolean, ForeignKey
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -50,6 +52,16 @@ class Repository(Base, TimestampMixin):
         lazy="dynamic",
     )
 
+    @cached_property
+    def owner_and_repo(self) -> Tuple[str, str]:
+        """
+        Owner and repository name parsed from full_name.
+
+        Cached on the instance so repeated GitHub calls skip the split.
+        """
+        owner, name = self.full_name.split("/", 1)
+        return owner, name
+
     def __repr__(self):
         return f"<Repository(id={self.id}, full_name='{self.full_name}', is_active={self.is_active})>"
 
@@ -3,11 +3,10 @@ Review model for storing code review results.
 """
 
 import uuid
-from datetime import datetime
 from sqlalchemy import Column, String, Integer, Text, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 from app.database import Base
-from app.models.base import GUID
+from app.models.base import GUID, utcnow
 
 
 class Review(Base):
@@ -38,7 +37,7 @@ class Review(Base):
     info_count = Column(Integer, default=0, nullable=False)
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow, nullable=False)
 
     # Relationships
     pull_request = relationship("PullRequest", back_populates="reviews")
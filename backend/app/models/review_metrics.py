@@ -3,7 +3,7 @@ ReviewMetrics model for storing aggregated analytics data.
 """
 
 import uuid
-from datetime import datetime, date as date_type
+from datetime import date as date_type
 from sqlalchemy import (
     Column,
     Integer,
@@ -15,7 +15,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import relationship
 from app.database import Base
-from app.models.base import GUID
+from app.models.base import GUID, utcnow
 
 
 class ReviewMetrics(Base):
@@ -44,7 +44,7 @@ class ReviewMetrics(Base):
     total_findings = Column(Integer, default=0, nullable=False)
     critical_findings = Column(Integer, default=0, nullable=False)
     avg_review_time_seconds = Column(Integer, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow, nullable=False)
 
     # Relationships
     repository = relationship("Repository", back_populates="review_metrics")
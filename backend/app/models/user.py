@@ -31,7 +31,10 @@ class User(Base, TimestampMixin):
         "Repository",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="dynamic",
+        # Plain list loaded once on first access. Not eager: users are loaded
+        # on every authenticated request, so callers that need repositories
+        # for many users should add selectinload() to their query instead
+        lazy="select",
     )
 
     def __repr__(self):
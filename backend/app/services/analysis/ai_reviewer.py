@@ -2,13 +2,26 @@
 AI-powered code reviewer using Claude API.
 """
 
-import json
+import heapq
 import re
+import orjson
 from pathlib import Path
 from typing import Dict, List, Any
-from app.services.analysis.base import BaseAnalyzer, AnalyzerResult
+from app.services.analysis.base import (
+    AnalyzerFinding,
+    AnalyzerResult,
+    BaseAnalyzer,
+)
 from app.services.claude_service import claude_service
 
+# Tool label and the severities accepted from Claude's response
+TOOL_SOURCE = "ai-claude"
+SEVERITIES = {"critical", "warning", "info"}
+
+# Patterns for pulling the JSON payload out of Claude's response
+JSON_FENCE_PATTERN = re.compile(r"```json\s*(.*?)\s*```", re.DOTALL)
+JSON_OBJECT_PATTERN = re.compile(r"\{.*\}", re.DOTALL)
+
 
 class AIReviewer(BaseAnalyzer):
     """AI-powered code reviewer using Claude API."""
@@ -94,14 +107,21 @@ class AIReviewer(BaseAnalyzer):
         Returns:
             Truncated dictionary of files
         """
-        # Sort files by size (smallest first)
-        sorted_files = sorted(files.items(), key=lambda x: len(x[1]))
+        # Heapify by size (O(n)) and pop smallest-first only until the budget
+        # runs out, rather than sorting every file; the index keeps ties in
+        # their original order
+        heap = [
+            (len(content), index, filename)
+            for index, (filename, content) in enumerate(files.items())
+        ]
+        heapq.heapify(heap)
 
         truncated = {}
         total_chars = 0
 
-        for filename, content in sorted_files:
-            file_size = len(content)
+        while heap:
+            file_size, _, filename = heapq.heappop(heap)
+            content = files[filename]
             if total_chars + file_size <= max_chars:
                 truncated[filename] = content
                 total_chars += file_size
@@ -114,7 +134,7 @@ class AIReviewer(BaseAnalyzer):
 
         return truncated
 
-    def _parse_ai_response(self, response: str) -> List[Dict[str, Any]]:
+    def _parse_ai_response(self, response: str) -> List[AnalyzerFinding]:
         """
         Parse Claude's JSON response into findings.
 
@@ -122,37 +142,37 @@ class AIReviewer(BaseAnalyzer):
             response: Raw response from Claude
 
         Returns:
-            List of finding dictionaries
+            List of parsed findings
         """
         findings = []
 
         try:
             # Extract JSON from response (may be wrapped in markdown code blocks)
-            json_match = re.search(r"```json\s*(.*?)\s*```", response, re.DOTALL)
+            json_match = JSON_FENCE_PATTERN.search(response)
             if json_match:
                 json_str = json_match.group(1)
             else:
                 # Try to find JSON object directly
-                json_match = re.search(r"\{.*\}", response, re.DOTALL)
+                json_match = JSON_OBJECT_PATTERN.search(response)
                 if json_match:
                     json_str = json_match.group(0)
                 else:
                     print(f"No JSON found in AI response: {response[:500]}")
                     # Create a generic finding from the text response
-                    return [{
-                        "category": "ai-review",
-                        "severity": "info",
-                        "title": "AI Code Review",
-                        "description": response[:1000] if response else "No feedback provided",
-                        "file_path": None,
-                        "line_number": None,
-                        "code_snippet": None,
-                        "suggestion": "Review the AI-generated feedback above",
-                        "tool_source": "ai-claude",
-                    }]
+                    return [AnalyzerFinding(
+                        category="ai-review",
+                        severity="info",
+                        title="AI Code Review",
+                        description=response[:1000] if response else "No feedback provided",
+                        file_path=None,
+                        line_number=None,
+                        code_snippet=None,
+                        suggestion="Review the AI-generated feedback above",
+                        tool_source="ai-claude",
+                    )]
 
             # Parse JSON
-            data = json.loads(json_str)
+            data = orjson.loads(json_str)
 
             # Extract findings
             ai_findings = data.get("findings", [])
@@ -160,41 +180,40 @@ class AIReviewer(BaseAnalyzer):
             for finding in ai_findings:
                 # Map AI categories to our standard categories
                 category = self._map_category(finding.get("category", "best-practices"))
-                severity = finding.get("severity", "info").lower()
-
                 # Validate severity
-                if severity not in ["critical", "warning", "info"]:
+                severity = finding.get("severity", "info").lower()
+                if severity not in SEVERITIES:
                     severity = "info"
 
-                finding_dict = {
-                    "category": category,
-                    "severity": severity,
-                    "title": finding.get("title", "AI Review Finding"),
-                    "description": finding.get("description", ""),
-                    "file_path": finding.get("file_path"),
-                    "line_number": finding.get("line_number"),
-                    "code_snippet": finding.get("code_snippet"),
-                    "suggestion": finding.get("suggestion"),
-                    "tool_source": "ai-claude",
-                }
-
-                findings.append(finding_dict)
-
-        except json.JSONDecodeError as e:
+                analyzer_finding = AnalyzerFinding(
+                    category=category,
+                    severity=severity,
+                    title=finding.get("title", "AI Review Finding"),
+                    description=finding.get("description", ""),
+                    file_path=finding.get("file_path"),
+                    line_number=finding.get("line_number"),
+                    code_snippet=finding.get("code_snippet"),
+                    suggestion=finding.get("suggestion"),
+                    tool_source=TOOL_SOURCE,
+                )
+
+                findings.append(analyzer_finding)
+
+        except orjson.JSONDecodeError as e:
             print(f"Failed to parse AI response as JSON: {e}")
             print(f"Response: {response[:500]}")
             # Create a generic finding from the text response
-            findings.append({
-                "category": "ai-review",
-                "severity": "info",
-                "title": "AI Code Review",
-                "description": response[:1000],  # Truncate to 1000 chars
-                "file_path": None,
-                "line_number": None,
-                "code_snippet": None,
-                "suggestion": "Review the AI-generated feedback above",
-                "tool_source": "ai-claude",
-            })
+            findings.append(AnalyzerFinding(
+                category="ai-review",
+                severity="info",
+                title="AI Code Review",
+                description=response[:1000],  # Truncate to 1000 chars
+                file_path=None,
+                line_number=None,
+                code_snippet=None,
+                suggestion="Review the AI-generated feedback above",
+                tool_source="ai-claude",
+            ))
         except Exception as e:
             print(f"Error parsing AI response: {e}")
 
@@ -2,12 +2,32 @@
 Base analyzer interface and utilities.
 """
 
+import asyncio
+import codecs
 import os
 import tempfile
 import shutil
-from typing import List, Dict, Any
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Dict, Any, Optional
 from abc import ABC, abstractmethod
-from pathlib import Path
+from pathlib import Path, PurePosixPath
+
+
+@dataclass(slots=True)
+class AnalyzerFinding:
+    """A single issue reported by an analyzer, shaped like a Finding row."""
+
+    category: str
+    severity: str
+    title: str
+    description: Optional[str] = None
+    file_path: Optional[str] = None
+    line_number: Optional[int] = None
+    code_snippet: Optional[str] = None
+    suggestion: Optional[str] = None
+    tool_source: Optional[str] = None
+    # Tool-specific details that are not stored (e.g. confidence, scores)
+    extra: Dict[str, Any] = field(default_factory=dict)
 
 
 class AnalyzerResult:
@@ -16,7 +36,7 @@ class AnalyzerResult:
     def __init__(
         self,
         tool: str,
-        findings: List[Dict[str, Any]],
+        findings: List[AnalyzerFinding],
         success: bool = True,
         error: str = None,
     ):
@@ -25,7 +45,7 @@ class AnalyzerResult:
 
         Args:
             tool: Name of the analysis tool
-            findings: List of finding dictionaries
+            findings: List of analyzer findings
             success: Whether analysis completed successfully
             error: Error message if analysis failed
         """
@@ -61,6 +81,19 @@ class BaseAnalyzer(ABC):
         """
         pass
 
+    def _workspace_paths(self, files: Dict[str, str], workspace: Path) -> List[str]:
+        """
+        Build tool arguments for exactly the files this analyzer was given.
+
+        Args:
+            files: Dictionary of filename -> file content
+            workspace: Path to temporary workspace directory
+
+        Returns:
+            List[str]: Workspace paths of the files
+        """
+        return [str(workspace / filepath) for filepath in files]
+
     def _map_severity(self, tool_severity: str) -> str:
         """
         Map tool-specific severity to our standard levels.
@@ -83,45 +116,139 @@ class BaseAnalyzer(ABC):
         return severity_map.get(tool_severity.upper(), "info")
 
 
-def extract_python_files_from_diff(diff_content: str) -> Dict[str, str]:
-    """
-    Extract Python file paths and content from a git diff.
+class _PythonDiffCollector:
+    """Collect added lines of Python files from diff lines fed one at a time."""
 
-    Args:
-        diff_content: Git diff string
+    def __init__(self):
+        """Initialize an empty collector."""
+        self.files: Dict[str, str] = {}
+        self._current_file = None
+        self._current_content: List[str] = []
 
-    Returns:
-        Dict[str, str]: Dictionary of filename -> file content
-    """
-    files = {}
-    current_file = None
-    current_content = []
+    def feed(self, line: str):
+        """
+        Process one diff line.
 
-    for line in diff_content.split("\n"):
+        Args:
+            line: Diff line without its trailing newline
+        """
         if line.startswith("diff --git"):
             # Save previous file
-            if current_file and current_content:
-                files[current_file] = "\n".join(current_content)
-                current_content = []
+            self._save_current()
 
             # Extract filename
             parts = line.split(" ")
             if len(parts) >= 4:
                 filepath = parts[3][2:]  # Remove 'b/' prefix
                 if filepath.endswith(".py"):
-                    current_file = filepath
+                    self._current_file = filepath
                 else:
-                    current_file = None
+                    self._current_file = None
 
-        elif current_file and line.startswith("+") and not line.startswith("+++"):
+        elif (
+            self._current_file and line.startswith("+") and not line.startswith("+++")
+        ):
             # This is an added line (excluding file header)
-            current_content.append(line[1:])  # Remove '+' prefix
+            self._current_content.append(line[1:])  # Remove '+' prefix
+
+    def finish(self) -> Dict[str, str]:
+        """
+        Save the last file and return everything collected.
+
+        Returns:
+            Dict[str, str]: Dictionary of filename -> file content
+        """
+        self._save_current()
+        return self.files
 
-    # Save last file
-    if current_file and current_content:
-        files[current_file] = "\n".join(current_content)
+    def _save_current(self):
+        """Store the file being collected, if it has any added lines."""
+        if self._current_file and self._current_content:
+            content = "\n".join(self._current_content)
+            # Whitespace-only additions (e.g. an empty __init__.py) have
+            # nothing for the analyzers to look at
+            if content.strip():
+                self.files[self._current_file] = content
+        self._current_content = []
 
-    return files
+
+def extract_python_files_from_diff(diff_content: str) -> Dict[str, str]:
+    """
+    Extract Python file paths and content from a git diff.
+
+    Args:
+        diff_content: Git diff string
+
+    Returns:
+        Dict[str, str]: Dictionary of filename -> file content
+    """
+    collector = _PythonDiffCollector()
+    for line in diff_content.split("\n"):
+        collector.feed(line)
+    return collector.finish()
+
+
+async def extract_python_files_from_diff_stream(
+    chunks: AsyncIterator[bytes],
+) -> Dict[str, str]:
+    """
+    Extract Python file paths and content from a streamed git diff.
+
+    Lines are parsed as chunks arrive, so the full diff is never held in
+    memory as one string.
+
+    Args:
+        chunks: Raw diff body chunks
+
+    Returns:
+        Dict[str, str]: Dictionary of filename -> file content
+    """
+    collector = _PythonDiffCollector()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+
+    async for chunk in chunks:
+        lines = (pending + decoder.decode(chunk)).split("\n")
+        # The last piece may be a partial line; carry it into the next chunk
+        pending = lines.pop()
+        for line in lines:
+            collector.feed(line)
+
+    collector.feed(pending + decoder.decode(b"", final=True))
+    return collector.finish()
+
+
+async def run_tool(*args: str, timeout: float) -> bytes:
+    """
+    Run an analysis tool as a subprocess without blocking the event loop.
+
+    The process is killed if it times out or the calling task is cancelled.
+
+    Args:
+        *args: Executable and its arguments
+        timeout: Seconds to wait for the tool to finish
+
+    Returns:
+        bytes: Captured standard output
+
+    Raises:
+        asyncio.TimeoutError: If the tool does not finish in time
+    """
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+
+    return stdout
 
 
 def create_temp_workspace() -> Path:
@@ -165,6 +292,24 @@ def write_files_to_workspace(files: Dict[str, str], workspace: Path):
             f.write(content)
 
 
+def is_test_file(filepath: str) -> bool:
+    """
+    Check whether a path looks like a test module.
+
+    Args:
+        filepath: Filename or path relative to the repository root
+
+    Returns:
+        bool: True for test_*.py, *_test.py and files under a tests/ directory
+    """
+    path = PurePosixPath(filepath)
+    return (
+        path.name.startswith("test_")
+        or path.name.endswith("_test.py")
+        or "tests" in path.parts[:-1]
+    )
+
+
 def get_file_extension(filename: str) -> str:
     """
     Get file extension from filename.
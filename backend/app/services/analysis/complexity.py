@@ -2,11 +2,20 @@
 Code complexity analyzer using Radon.
 """
 
+import asyncio
 import json
-import subprocess
+import shutil
 from typing import Dict, List, Any
 from pathlib import Path
-from app.services.analysis.base import BaseAnalyzer, AnalyzerResult
+from app.services.analysis.base import (
+    AnalyzerFinding,
+    AnalyzerResult,
+    BaseAnalyzer,
+    run_tool,
+)
+
+# Resolve the Radon executable once per process rather than on every run
+RADON_EXECUTABLE = shutil.which("radon") or "radon"
 
 
 class ComplexityAnalyzer(BaseAnalyzer):
@@ -36,13 +45,18 @@ class ComplexityAnalyzer(BaseAnalyzer):
         """
         findings = []
 
+        if not files:
+            return AnalyzerResult(tool="radon", findings=findings, success=True)
+
+        paths = self._workspace_paths(files, workspace)
+
         try:
-            # Run Radon cyclomatic complexity
-            cc_findings = await self._analyze_cyclomatic_complexity(workspace)
+            # Run Radon cyclomatic complexity and maintainability index together
+            cc_findings, mi_findings = await asyncio.gather(
+                self._analyze_cyclomatic_complexity(paths, workspace),
+                self._analyze_maintainability(paths, workspace),
+            )
             findings.extend(cc_findings)
-
-            # Run Radon maintainability index
-            mi_findings = await self._analyze_maintainability(workspace)
             findings.extend(mi_findings)
 
             return AnalyzerResult(tool="radon", findings=findings, success=True)
@@ -53,77 +67,73 @@ class ComplexityAnalyzer(BaseAnalyzer):
             )
 
     async def _analyze_cyclomatic_complexity(
-        self, workspace: Path
-    ) -> List[Dict[str, Any]]:
+        self, paths: List[str], workspace: Path
+    ) -> List[AnalyzerFinding]:
         """
         Analyze cyclomatic complexity with Radon.
 
         Args:
+            paths: Workspace paths of the files to analyze
             workspace: Path to workspace directory
 
         Returns:
-            List[Dict[str, Any]]: Complexity findings
+            List[AnalyzerFinding]: Complexity findings
         """
         try:
-            result = subprocess.run(
-                [
-                    "radon",
-                    "cc",
-                    str(workspace),
-                    "-j",  # JSON output
-                    "-n",
-                    "C",  # Show C grade and above (complexity >= 11)
-                ],
-                capture_output=True,
-                text=True,
+            stdout = await run_tool(
+                RADON_EXECUTABLE,
+                "cc",
+                *paths,
+                "-j",  # JSON output
+                "-n",
+                "C",  # Show C grade and above (complexity >= 11)
                 timeout=30,
             )
 
-            if result.stdout:
-                radon_data = json.loads(result.stdout)
+            if stdout:
+                radon_data = json.loads(stdout)
                 return self._parse_complexity_output(radon_data, workspace)
 
             return []
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             return []
         except json.JSONDecodeError:
             return []
         except Exception:
             return []
 
-    async def _analyze_maintainability(self, workspace: Path) -> List[Dict[str, Any]]:
+    async def _analyze_maintainability(
+        self, paths: List[str], workspace: Path
+    ) -> List[AnalyzerFinding]:
         """
         Analyze maintainability index with Radon.
 
         Args:
+            paths: Workspace paths of the files to analyze
             workspace: Path to workspace directory
 
         Returns:
-            List[Dict[str, Any]]: Maintainability findings
+            List[AnalyzerFinding]: Maintainability findings
         """
         try:
-            result = subprocess.run(
-                [
-                    "radon",
-                    "mi",
-                    str(workspace),
-                    "-j",  # JSON output
-                    "-n",
-                    "B",  # Show B grade and below (MI < 65)
-                ],
-                capture_output=True,
-                text=True,
+            stdout = await run_tool(
+                RADON_EXECUTABLE,
+                "mi",
+                *paths,
+                "-j",  # JSON output
+                "-n",
+                "B",  # Show B grade and below (MI < 65)
                 timeout=30,
             )
 
-            if result.stdout:
-                radon_data = json.loads(result.stdout)
+            if stdout:
+                radon_data = json.loads(stdout)
                 return self._parse_maintainability_output(radon_data, workspace)
 
             return []
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             return []
         except json.JSONDecodeError:
             return []
@@ -132,7 +142,7 @@ class ComplexityAnalyzer(BaseAnalyzer):
 
     def _parse_complexity_output(
         self, radon_data: Dict[str, Any], workspace: Path
-    ) -> List[Dict[str, Any]]:
+    ) -> List[AnalyzerFinding]:
         """
         Parse Radon cyclomatic complexity JSON output.
 
@@ -141,7 +151,7 @@ class ComplexityAnalyzer(BaseAnalyzer):
             workspace: Workspace path for relative path calculation
 
         Returns:
-            List[Dict[str, Any]]: List of finding dictionaries
+            List[AnalyzerFinding]: Parsed findings
         """
         findings = []
 
@@ -169,19 +179,21 @@ class ComplexityAnalyzer(BaseAnalyzer):
                 else:
                     suggestion = "This function has acceptable complexity."
 
-                finding = {
-                    "category": "complexity",
-                    "severity": severity,
-                    "title": f"High cyclomatic complexity in {func.get('name', 'function')}",
-                    "description": f"Function '{func.get('name', 'unknown')}' has cyclomatic complexity of {complexity} (rank {rank})",
-                    "file_path": str(rel_path),
-                    "line_number": func.get("lineno", 0),
-                    "code_snippet": "",
-                    "suggestion": suggestion,
-                    "tool_source": "radon",
-                    "complexity_score": complexity,
-                    "complexity_rank": rank,
-                }
+                finding = AnalyzerFinding(
+                    category="complexity",
+                    severity=severity,
+                    title=f"High cyclomatic complexity in {func.get('name', 'function')}",
+                    description=f"Function '{func.get('name', 'unknown')}' has cyclomatic complexity of {complexity} (rank {rank})",
+                    file_path=str(rel_path),
+                    line_number=func.get("lineno", 0),
+                    code_snippet="",
+                    suggestion=suggestion,
+                    tool_source="radon",
+                    extra={
+                        "complexity_score": complexity,
+                        "complexity_rank": rank,
+                    },
+                )
 
                 findings.append(finding)
 
@@ -189,7 +201,7 @@ class ComplexityAnalyzer(BaseAnalyzer):
 
     def _parse_maintainability_output(
         self, radon_data: Dict[str, Any], workspace: Path
-    ) -> List[Dict[str, Any]]:
+    ) -> List[AnalyzerFinding]:
         """
         Parse Radon maintainability index JSON output.
 
@@ -198,7 +210,7 @@ class ComplexityAnalyzer(BaseAnalyzer):
             workspace: Workspace path for relative path calculation
 
         Returns:
-            List[Dict[str, Any]]: List of finding dictionaries
+            List[AnalyzerFinding]: Parsed findings
         """
         findings = []
 
@@ -228,19 +240,21 @@ class ComplexityAnalyzer(BaseAnalyzer):
             else:
                 suggestion = "This file has moderate maintainability. Minor improvements recommended."
 
-            finding = {
-                "category": "maintainability",
-                "severity": severity,
-                "title": f"Low maintainability index in {rel_path.name}",
-                "description": f"File has maintainability index of {mi:.2f} (rank {rank})",
-                "file_path": str(rel_path),
-                "line_number": 1,
-                "code_snippet": "",
-                "suggestion": suggestion,
-                "tool_source": "radon",
-                "maintainability_index": mi,
-                "maintainability_rank": rank,
-            }
+            finding = AnalyzerFinding(
+                category="maintainability",
+                severity=severity,
+                title=f"Low maintainability index in {rel_path.name}",
+                description=f"File has maintainability index of {mi:.2f} (rank {rank})",
+                file_path=str(rel_path),
+                line_number=1,
+                code_snippet="",
+                suggestion=suggestion,
+                tool_source="radon",
+                extra={
+                    "maintainability_index": mi,
+                    "maintainability_rank": rank,
+                },
+            )
 
             findings.append(finding)
 
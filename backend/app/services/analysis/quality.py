@@ -2,11 +2,20 @@
 Code quality analyzer using Pylint and Radon.
 """
 
+import asyncio
 import json
-import subprocess
+import shutil
 from typing import Dict, List, Any
 from pathlib import Path
-from app.services.analysis.base import BaseAnalyzer, AnalyzerResult
+from app.services.analysis.base import (
+    AnalyzerFinding,
+    AnalyzerResult,
+    BaseAnalyzer,
+    run_tool,
+)
+
+# Resolve the Pylint executable once per process rather than on every run
+PYLINT_EXECUTABLE = shutil.which("pylint") or "pylint"
 
 
 class QualityAnalyzer(BaseAnalyzer):
@@ -34,25 +43,21 @@ class QualityAnalyzer(BaseAnalyzer):
             AnalyzerResult: Quality analysis results
         """
         try:
-            # Run Pylint on workspace
-            result = subprocess.run(
-                [
-                    "pylint",
-                    str(workspace),
-                    "--output-format=json",
-                    "--disable=all",  # Disable all then enable specific
-                    "--enable=E,W,R",  # Enable errors, warnings, refactors
-                    "--max-line-length=120",
-                    "--good-names=i,j,k,v,f,fp,db",
-                ],
-                capture_output=True,
-                text=True,
+            # Run Pylint on the given files without blocking the event loop
+            stdout = await run_tool(
+                PYLINT_EXECUTABLE,
+                *self._workspace_paths(files, workspace),
+                "--output-format=json",
+                "--disable=all",  # Disable all then enable specific
+                "--enable=E,W,R",  # Enable errors, warnings, refactors
+                "--max-line-length=120",
+                "--good-names=i,j,k,v,f,fp,db",
                 timeout=90,  # 90 second timeout
             )
 
             # Parse JSON output
-            if result.stdout:
-                pylint_data = json.loads(result.stdout)
+            if stdout:
+                pylint_data = json.loads(stdout)
                 findings = self._parse_pylint_output(pylint_data, workspace)
                 return AnalyzerResult(
                     tool="pylint", findings=findings, success=True
@@ -61,7 +66,7 @@ class QualityAnalyzer(BaseAnalyzer):
                 # No issues found
                 return AnalyzerResult(tool="pylint", findings=[], success=True)
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             return AnalyzerResult(
                 tool="pylint",
                 findings=[],
@@ -78,7 +83,7 @@ class QualityAnalyzer(BaseAnalyzer):
 
     def _parse_pylint_output(
         self, pylint_data: List[Dict[str, Any]], workspace: Path
-    ) -> List[Dict[str, Any]]:
+    ) -> List[AnalyzerFinding]:
         """
         Parse Pylint JSON output into findings.
 
@@ -87,7 +92,7 @@ class QualityAnalyzer(BaseAnalyzer):
             workspace: Workspace path for relative path calculation
 
         Returns:
-            List[Dict[str, Any]]: List of finding dictionaries
+            List[AnalyzerFinding]: Parsed findings
         """
         findings = []
 
@@ -100,18 +105,20 @@ class QualityAnalyzer(BaseAnalyzer):
                 message.get("symbol", ""), message.get("message", "")
             )
 
-            finding = {
-                "category": "quality",
-                "severity": self._map_pylint_severity(message.get("type", "info")),
-                "title": message.get("message", "Code quality issue"),
-                "description": f"{message.get('message', '')} ({message.get('symbol', '')})",
-                "file_path": str(file_path),
-                "line_number": message.get("line", 0),
-                "code_snippet": "",  # Pylint doesn't provide this
-                "suggestion": suggestion,
-                "tool_source": "pylint",
-                "message_id": message.get("message-id", ""),
-            }
+            finding = AnalyzerFinding(
+                category="quality",
+                severity=self._map_pylint_severity(message.get("type", "info")),
+                title=message.get("message", "Code quality issue"),
+                description=f"{message.get('message', '')} ({message.get('symbol', '')})",
+                file_path=str(file_path),
+                line_number=message.get("line", 0),
+                code_snippet="",  # Pylint doesn't provide this
+                suggestion=suggestion,
+                tool_source="pylint",
+                extra={
+                    "message_id": message.get("message-id", ""),
+                },
+            )
 
             findings.append(finding)
 
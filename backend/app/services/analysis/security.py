@@ -2,11 +2,29 @@
 Security analyzer using Bandit.
 """
 
+import asyncio
 import json
-import subprocess
+import shutil
 from typing import Dict, List, Any
 from pathlib import Path
-from app.services.analysis.base import BaseAnalyzer, AnalyzerResult
+from app.services.analysis.base import (
+    AnalyzerFinding,
+    AnalyzerResult,
+    BaseAnalyzer,
+    run_tool,
+)
+
+# Resolve the Bandit executable once per process rather than on every run
+BANDIT_EXECUTABLE = shutil.which("bandit") or "bandit"
+
+# Labels written on every Bandit finding
+CATEGORY_SECURITY = "security"
+TOOL_SOURCE = "bandit"
+SEVERITY_MAP = {
+    "HIGH": "critical",
+    "MEDIUM": "warning",
+    "LOW": "info",
+}
 
 
 class SecurityAnalyzer(BaseAnalyzer):
@@ -15,11 +33,7 @@ class SecurityAnalyzer(BaseAnalyzer):
     def __init__(self):
         """Initialize security analyzer."""
         super().__init__("bandit")
-        self.severity_map = {
-            "HIGH": "critical",
-            "MEDIUM": "warning",
-            "LOW": "info",
-        }
+        self.severity_map = SEVERITY_MAP
         self.suggestions = {
             "B105": "Use environment variables or secure configuration management instead of hardcoded passwords",
             "B106": "Use environment variables or secure configuration management instead of hardcoded passwords",
@@ -85,24 +99,27 @@ class SecurityAnalyzer(BaseAnalyzer):
             AnalyzerResult: Security analysis results
         """
         try:
-            # Run Bandit on workspace
-            result = subprocess.run(
-                [
-                    "bandit",
-                    "-r",  # Recursive
-                    str(workspace),
+            # Run Bandit on the given files without blocking the event loop
+            try:
+                stdout = await run_tool(
+                    BANDIT_EXECUTABLE,
+                    *self._workspace_paths(files, workspace),
                     "-f",
                     "json",  # JSON output
                     "-ll",  # Low level and above
-                ],
-                capture_output=True,
-                text=True,
-                timeout=60,  # 60 second timeout
-            )
+                    timeout=60,  # 60 second timeout
+                )
+            except asyncio.TimeoutError:
+                return AnalyzerResult(
+                    tool="bandit",
+                    findings=[],
+                    success=False,
+                    error="Bandit analysis timed out",
+                )
 
             # Parse JSON output
-            if result.stdout:
-                bandit_data = json.loads(result.stdout)
+            if stdout:
+                bandit_data = json.loads(stdout)
                 findings = self._parse_bandit_output(bandit_data, workspace)
                 return AnalyzerResult(
                     tool="bandit", findings=findings, success=True
@@ -111,13 +128,6 @@ class SecurityAnalyzer(BaseAnalyzer):
                 # No issues found or error
                 return AnalyzerResult(tool="bandit", findings=[], success=True)
 
-        except subprocess.TimeoutExpired:
-            return AnalyzerResult(
-                tool="bandit",
-                findings=[],
-                success=False,
-                error="Bandit analysis timed out",
-            )
         except json.JSONDecodeError:
             return AnalyzerResult(
                 tool="bandit",
@@ -132,7 +142,7 @@ class SecurityAnalyzer(BaseAnalyzer):
 
     def _parse_bandit_output(
         self, bandit_data: Dict[str, Any], workspace: Path
-    ) -> List[Dict[str, Any]]:
+    ) -> List[AnalyzerFinding]:
         """
         Parse Bandit JSON output into findings.
 
@@ -141,35 +151,33 @@ class SecurityAnalyzer(BaseAnalyzer):
             workspace: Workspace path for relative path calculation
 
         Returns:
-            List[Dict[str, Any]]: List of finding dictionaries
+            List[AnalyzerFinding]: Parsed findings
         """
         findings = []
+        suggestions = self.suggestions
 
         for result in bandit_data.get("results", []):
-            # Get relative path from workspace
-            file_path = Path(result["filename"]).relative_to(workspace)
-
-            # Extract code snippet (get the line from code if available)
-            code_snippet = result.get("code", "").strip()
-
-            # Generate suggestion based on test_id
+            # Bind each field once per iteration
+            issue_text = result["issue_text"]
             test_id = result.get("test_id", "")
-            suggestion = self.suggestions.get(
-                test_id, "Review and fix this security issue"
-            )
 
-            finding = {
-                "category": "security",
-                "severity": self._map_severity(result["issue_severity"]),
-                "title": result["issue_text"],
-                "description": f"{result['issue_text']} ({test_id}: {result['test_name']})",
-                "file_path": str(file_path),
-                "line_number": result["line_number"],
-                "code_snippet": code_snippet,
-                "suggestion": suggestion,
-                "tool_source": "bandit",
-                "confidence": result.get("issue_confidence", "MEDIUM"),
-            }
+            finding = AnalyzerFinding(
+                category=CATEGORY_SECURITY,
+                severity=self._map_severity(result["issue_severity"]),
+                title=issue_text,
+                description=f"{issue_text} ({test_id}: {result['test_name']})",
+                # Relative path from workspace
+                file_path=str(Path(result["filename"]).relative_to(workspace)),
+                line_number=result["line_number"],
+                code_snippet=result.get("code", "").strip(),
+                suggestion=suggestions.get(
+                    test_id, "Review and fix this security issue"
+                ),
+                tool_source=TOOL_SOURCE,
+                extra={
+                    "confidence": result.get("issue_confidence", "MEDIUM"),
+                },
+            )
 
             findings.append(finding)
 
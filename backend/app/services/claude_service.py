@@ -2,10 +2,85 @@
 Claude API service for AI-powered code review.
 """
 
-import anthropic
 from typing import List, Dict, Any, Optional
 from app.config import settings
 
+# Static review instructions, sent as a cacheable prefix ahead of the code
+REVIEW_INSTRUCTIONS = "\n".join([
+    "You are an expert code reviewer. Please review the Python code changes that follow.",
+    "",
+    "Focus on:",
+    "1. **Best Practices**: Adherence to Python best practices and idioms",
+    "2. **Design Patterns**: Appropriate use of design patterns",
+    "3. **Error Handling**: Proper exception handling and edge cases",
+    "4. **Performance**: Potential performance issues or optimizations",
+    "5. **Maintainability**: Code clarity, documentation, and long-term maintainability",
+    "6. **Testing**: Testability and test coverage considerations",
+    "7. **Architecture**: Overall design and architectural concerns",
+    "",
+    "## Review Instructions",
+    "",
+    "Provide your review in the following JSON format:",
+    "```json",
+    "{",
+    '  "findings": [',
+    "    {",
+    '      "category": "best-practices|design|error-handling|performance|maintainability|testing|architecture",',
+    '      "severity": "critical|warning|info",',
+    '      "title": "Brief title of the issue",',
+    '      "description": "Detailed explanation of the issue",',
+    '      "file_path": "path/to/file.py",',
+    '      "line_number": 42,',
+    '      "code_snippet": "problematic code snippet",',
+    '      "suggestion": "How to fix or improve this"',
+    "    }",
+    "  ],",
+    '  "summary": "Overall assessment of the code quality and key recommendations"',
+    "}",
+    "```",
+    "",
+    "Guidelines:",
+    "- Only report genuine issues, not nitpicks",
+    "- Prioritize critical issues (security, bugs, major design flaws)",
+    "- Be constructive and specific in your suggestions",
+    "- Include line numbers when referencing specific code",
+    "- If the code is excellent, say so with minimal or no findings",
+])
+
+# Static instructions for analyze_findings, sent as a cacheable prefix
+FINDINGS_ANALYSIS_INSTRUCTIONS = "\n".join([
+    "You are an expert code reviewer. The issues that follow were detected by automated tools.",
+    "Please provide additional context, prioritization, and recommendations.",
+    "",
+    "## Analysis Request",
+    "",
+    "Please provide:",
+    "1. Overall risk assessment (low/medium/high)",
+    "2. Top 3 most critical issues that should be addressed immediately",
+    "3. Recommended action plan",
+    "",
+    "Respond in JSON format:",
+    "```json",
+    "{",
+    '  "risk_level": "low|medium|high",',
+    '  "critical_issues": ["issue 1", "issue 2", "issue 3"],',
+    '  "action_plan": "Recommended steps to address the issues"',
+    "}",
+    "```",
+])
+
+# Content blocks marked for Anthropic prompt caching, built once per process
+CACHED_REVIEW_INSTRUCTIONS = {
+    "type": "text",
+    "text": REVIEW_INSTRUCTIONS,
+    "cache_control": {"type": "ephemeral"},
+}
+CACHED_FINDINGS_ANALYSIS_INSTRUCTIONS = {
+    "type": "text",
+    "text": FINDINGS_ANALYSIS_INSTRUCTIONS,
+    "cache_control": {"type": "ephemeral"},
+}
+
 
 class ClaudeService:
     """Service for interacting with Anthropic Claude API."""
@@ -14,6 +89,9 @@ class ClaudeService:
         """Initialize Claude API client."""
         self.client = None
         if settings.ANTHROPIC_API_KEY:
+            # Import lazily so deployments without Claude skip loading the SDK
+            import anthropic
+
             self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
         self.model = settings.ANTHROPIC_MODEL
         self.max_tokens = settings.ANTHROPIC_MAX_TOKENS
@@ -56,7 +134,10 @@ class ClaudeService:
                 messages=[
                     {
                         "role": "user",
-                        "content": prompt,
+                        "content": [
+                            CACHED_REVIEW_INSTRUCTIONS,
+                            {"type": "text", "text": prompt},
+                        ],
                     }
                 ],
             )
@@ -78,7 +159,10 @@ class ClaudeService:
         pr_context: Optional[Dict[str, Any]] = None,
     ) -> str:
         """
-        Build a comprehensive review prompt for Claude.
+        Build the per-review part of the prompt for Claude.
+
+        The static instructions live in REVIEW_INSTRUCTIONS and are sent
+        as a separate cached content block ahead of this text.
 
         Args:
             files: Dictionary of filename -> file content
@@ -87,19 +171,7 @@ class ClaudeService:
         Returns:
             str: Formatted prompt
         """
-        prompt_parts = [
-            "You are an expert code reviewer. Please review the following Python code changes.",
-            "",
-            "Focus on:",
-            "1. **Best Practices**: Adherence to Python best practices and idioms",
-            "2. **Design Patterns**: Appropriate use of design patterns",
-            "3. **Error Handling**: Proper exception handling and edge cases",
-            "4. **Performance**: Potential performance issues or optimizations",
-            "5. **Maintainability**: Code clarity, documentation, and long-term maintainability",
-            "6. **Testing**: Testability and test coverage considerations",
-            "7. **Architecture**: Overall design and architectural concerns",
-            "",
-        ]
+        prompt_parts = []
 
         # Add PR context if available
         if pr_context:
@@ -123,37 +195,6 @@ class ClaudeService:
                 "",
             ])
 
-        # Add review instructions
-        prompt_parts.extend([
-            "## Review Instructions",
-            "",
-            "Provide your review in the following JSON format:",
-            "```json",
-            "{",
-            '  "findings": [',
-            "    {",
-            '      "category": "best-practices|design|error-handling|performance|maintainability|testing|architecture",',
-            '      "severity": "critical|warning|info",',
-            '      "title": "Brief title of the issue",',
-            '      "description": "Detailed explanation of the issue",',
-            '      "file_path": "path/to/file.py",',
-            '      "line_number": 42,',
-            '      "code_snippet": "problematic code snippet",',
-            '      "suggestion": "How to fix or improve this"',
-            "    }",
-            "  ],",
-            '  "summary": "Overall assessment of the code quality and key recommendations"',
-            "}",
-            "```",
-            "",
-            "Guidelines:",
-            "- Only report genuine issues, not nitpicks",
-            "- Prioritize critical issues (security, bugs, major design flaws)",
-            "- Be constructive and specific in your suggestions",
-            "- Include line numbers when referencing specific code",
-            "- If the code is excellent, say so with minimal or no findings",
-        ])
-
         return "\n".join(prompt_parts)
 
     async def analyze_findings(
@@ -176,9 +217,6 @@ class ClaudeService:
 
         # Build prompt for finding analysis
         prompt_parts = [
-            "You are an expert code reviewer. The following issues were detected by automated tools.",
-            "Please provide additional context, prioritization, and recommendations.",
-            "",
             "## Detected Issues",
             "",
         ]
@@ -194,30 +232,20 @@ class ClaudeService:
                 "",
             ])
 
-        prompt_parts.extend([
-            "## Analysis Request",
-            "",
-            "Please provide:",
-            "1. Overall risk assessment (low/medium/high)",
-            "2. Top 3 most critical issues that should be addressed immediately",
-            "3. Recommended action plan",
-            "",
-            "Respond in JSON format:",
-            "```json",
-            "{",
-            '  "risk_level": "low|medium|high",',
-            '  "critical_issues": ["issue 1", "issue 2", "issue 3"],',
-            '  "action_plan": "Recommended steps to address the issues"',
-            "}",
-            "```",
-        ])
-
         try:
             message = self.client.messages.create(
                 model=self.model,
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
-                messages=[{"role": "user", "content": "\n".join(prompt_parts)}],
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            CACHED_FINDINGS_ANALYSIS_INSTRUCTIONS,
+                            {"type": "text", "text": "\n".join(prompt_parts)},
+                        ],
+                    }
+                ],
             )
 
             response_text = ""
@@ -2,13 +2,47 @@
 GitHub API service for OAuth authentication and repository interactions.
 """
 
+import asyncio
+import binascii
 import httpx
 import hmac
 import hashlib
-from typing import Dict, List, Optional, Any
+import orjson
+import time
+from collections import OrderedDict
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from fastapi import HTTPException, status
 from app.config import settings
 
+# Maximum number of ETag/Last-Modified responses kept for conditional requests
+ETAG_CACHE_MAX_ENTRIES = 10_000
+
+# Read size when streaming PR diffs
+DIFF_CHUNK_SIZE = 65536
+
+# Rate limiting: concurrent in-flight requests, low-quota threshold and backoff
+RATE_LIMIT_CONCURRENCY = 64
+RATE_LIMIT_LOW_REMAINING = 10
+RATE_LIMIT_MAX_RETRIES = 3
+RATE_LIMIT_INITIAL_BACKOFF = 1.0
+RATE_LIMIT_MAX_BACKOFF = 60.0
+
+# Default headers sent on every API request (set on the shared client)
+_BASE_HEADERS = {
+    "Accept": "application/vnd.github+json",
+    "X-GitHub-Api-Version": "2022-11-28",
+}
+# Headers for requesting a PR as a unified diff instead of JSON
+_DIFF_HEADERS = {**_BASE_HEADERS, "Accept": "application/vnd.github.v3.diff"}
+# Headers for the OAuth token exchange on github.com
+_OAUTH_HEADERS = {"Accept": "application/json"}
+
+
+def _parse_json(response: httpx.Response) -> Any:
+    """Parse a response body with orjson (faster than httpx's stdlib json)."""
+    return orjson.loads(response.content)
+
 
 class GitHubService:
     """Service for interacting with GitHub API."""
@@ -19,7 +53,267 @@ class GitHubService:
         self.client_id = settings.GITHUB_CLIENT_ID
         self.client_secret = settings.GITHUB_CLIENT_SECRET
         self.webhook_secret = settings.GITHUB_WEBHOOK_SECRET
+        self._webhook_secret_bytes = self.webhook_secret.encode("utf-8")
         self.oauth_token_url = settings.GITHUB_OAUTH_TOKEN_URL
+        self._client: Optional[httpx.AsyncClient] = None
+        # LRU of (token hash, path, params) -> (etag, last modified, parsed body)
+        self._etag_cache: "OrderedDict[Tuple, Tuple]" = OrderedDict()
+        self._rl_semaphore = asyncio.Semaphore(RATE_LIMIT_CONCURRENCY)
+        # Token hash -> monotonic time before which that token's requests wait
+        # for its quota to reset (GitHub counts the quota per token)
+        self._rl_resume_at: Dict[bytes, float] = {}
+
+    async def startup(self) -> None:
+        """Create the shared HTTP client (called on application startup)."""
+        if self._client is None:
+            self._client = self._create_client()
+
+    async def shutdown(self) -> None:
+        """Close the shared HTTP client (called on application shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Shared HTTP client reused across all GitHub calls.
+
+        Keeps connections alive between requests so each call does not pay
+        for a new TCP/TLS handshake. Created on first use if startup() has
+        not been called.
+        """
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """
+        Build the pooled HTTP client for the GitHub API.
+
+        Uses HTTP/2 so concurrent calls for the same PR (metadata, diff,
+        files) multiplex over a single connection.
+
+        Returns:
+            Configured httpx.AsyncClient
+        """
+        return httpx.AsyncClient(
+            base_url=self.api_base_url,
+            headers=_BASE_HEADERS,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.GITHUB_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GITHUB_HTTP_KEEPALIVE,
+                keepalive_expiry=30.0,
+            ),
+            timeout=httpx.Timeout(10.0),
+        )
+
+    @staticmethod
+    def _auth(access_token: str) -> Dict[str, str]:
+        """
+        Build the per-request authorization header.
+
+        Args:
+            access_token: GitHub access token
+
+        Returns:
+            Fresh headers dict containing only Authorization
+        """
+        return {"Authorization": f"Bearer {access_token}"}
+
+    @staticmethod
+    def _token_key(access_token: str) -> bytes:
+        """
+        Hash an access token for use as a cache key.
+
+        Args:
+            access_token: GitHub access token
+
+        Returns:
+            16-byte BLAKE2b digest of the token
+        """
+        return hashlib.blake2b(access_token.encode("utf-8"), digest_size=16).digest()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        access_token: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a request to GitHub, respecting its rate-limit headers.
+
+        Limits concurrent requests, holds new requests back while the
+        primary quota is nearly exhausted, and retries rate-limited
+        403/429 replies after Retry-After or an exponential backoff.
+
+        Args:
+            method: HTTP method
+            path: API path relative to the base URL, or an absolute URL
+            access_token: Optional GitHub access token
+            headers: Optional extra request headers
+            **kwargs: Additional arguments passed to httpx
+
+        Returns:
+            Final HTTP response (possibly still rate limited)
+        """
+        request_headers = self._auth(access_token) if access_token else {}
+        if headers:
+            request_headers.update(headers)
+        # Unauthenticated calls (e.g. the OAuth code exchange) are never gated
+        token_key = self._token_key(access_token) if access_token else None
+
+        backoff = RATE_LIMIT_INITIAL_BACKOFF
+        for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+            await self._wait_for_rate_limit(token_key)
+
+            async with self._rl_semaphore:
+                response = await self.client.request(
+                    method, path, headers=request_headers, **kwargs
+                )
+
+            self._update_rate_limit(response, token_key)
+
+            if attempt == RATE_LIMIT_MAX_RETRIES or not self._is_rate_limited(response):
+                return response
+
+            retry_after = response.headers.get("Retry-After", "")
+            wait = float(retry_after) if retry_after.isdigit() else backoff
+            if wait > RATE_LIMIT_MAX_BACKOFF:
+                # Not worth holding the caller that long; surface the error
+                return response
+
+            await asyncio.sleep(wait)
+            backoff = min(backoff * 2, RATE_LIMIT_MAX_BACKOFF)
+
+        return response
+
+    async def _wait_for_rate_limit(self, token_key: Optional[bytes]) -> None:
+        """
+        Wait while a token's requests are gated by its nearly exhausted quota.
+
+        Args:
+            token_key: Hashed access token, or None for unauthenticated calls
+        """
+        if token_key is None:
+            return
+
+        resume_at = self._rl_resume_at.get(token_key)
+        if resume_at is None:
+            return
+
+        delay = resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            # Quota has reset; drop the entry so the map stays small
+            self._rl_resume_at.pop(token_key, None)
+
+    def _update_rate_limit(
+        self, response: httpx.Response, token_key: Optional[bytes]
+    ) -> None:
+        """
+        Gate a token's later requests when its primary rate limit is nearly used up.
+
+        Args:
+            response: Response carrying X-RateLimit-* headers
+            token_key: Hashed access token, or None for unauthenticated calls
+        """
+        if token_key is None:
+            return
+
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if not (remaining and reset and remaining.isdigit() and reset.isdigit()):
+            return
+
+        if int(remaining) < RATE_LIMIT_LOW_REMAINING:
+            wait = min(max(int(reset) - time.time(), 0.0), RATE_LIMIT_MAX_BACKOFF)
+            self._rl_resume_at[token_key] = max(
+                self._rl_resume_at.get(token_key, 0.0), time.monotonic() + wait
+            )
+
+    @staticmethod
+    def _is_rate_limited(response: httpx.Response) -> bool:
+        """
+        Check whether a response was rejected by a GitHub rate limit.
+
+        Plain 403s (missing permissions) are not retried.
+
+        Args:
+            response: HTTP response
+
+        Returns:
+            True if the request should be retried later
+        """
+        if response.status_code == 429:
+            return True
+        return response.status_code == 403 and (
+            "Retry-After" in response.headers
+            or response.headers.get("X-RateLimit-Remaining") == "0"
+        )
+
+    async def _get_json(
+        self,
+        path: str,
+        access_token: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[int, Any]:
+        """
+        GET a JSON resource, revalidating cached copies conditionally.
+
+        Sends If-None-Match when an earlier response for the same token,
+        path and params carried an ETag, or If-Modified-Since when it only
+        carried Last-Modified. A 304 Not Modified reply is served from the
+        cache and does not count against the primary rate limit.
+
+        Args:
+            path: API path relative to the base URL
+            access_token: GitHub access token
+            params: Optional query parameters
+
+        Returns:
+            Tuple of (status code, parsed JSON body or None on error)
+        """
+        key = (
+            self._token_key(access_token),
+            path,
+            tuple(sorted(params.items())) if params else (),
+        )
+
+        headers = {}
+        cached = self._etag_cache.get(key)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            else:
+                headers["If-Modified-Since"] = last_modified
+
+        response = await self._request(
+            "GET", path, access_token, headers=headers, params=params
+        )
+
+        if response.status_code == 304 and cached:
+            self._etag_cache.move_to_end(key)
+            return 200, cached[2]
+
+        if response.status_code != 200:
+            return response.status_code, None
+
+        data = _parse_json(response)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._etag_cache[key] = (etag, last_modified, data)
+            self._etag_cache.move_to_end(key)
+            if len(self._etag_cache) > ETAG_CACHE_MAX_ENTRIES:
+                self._etag_cache.popitem(last=False)
+
+        return 200, data
 
     async def exchange_code_for_token(self, code: str) -> str:
         """
@@ -34,32 +328,32 @@ class GitHubService:
         Raises:
             HTTPException: If token exchange fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.oauth_token_url,
-                headers={"Accept": "application/json"},
-                data={
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "code": code,
-                },
-            )
+        response = await self._request(
+            "POST",
+            self.oauth_token_url,
+            headers=_OAUTH_HEADERS,
+            data={
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "code": code,
+            },
+        )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to exchange code for token",
-                )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to exchange code for token",
+            )
 
-            data = response.json()
+        data = _parse_json(response)
 
-            if "error" in data:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"GitHub OAuth error: {data.get('error_description', 'Unknown error')}",
-                )
+        if "error" in data:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"GitHub OAuth error: {data.get('error_description', 'Unknown error')}",
+            )
 
-            return data["access_token"]
+        return data["access_token"]
 
     async def get_user_info(self, access_token: str) -> Dict[str, Any]:
         """
@@ -74,23 +368,15 @@ class GitHubService:
         Raises:
             HTTPException: If request fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.api_base_url}/user",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github+json",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-            )
+        response = await self._request("GET", "/user", access_token)
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Failed to fetch user info from GitHub",
-                )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Failed to fetch user info from GitHub",
+            )
 
-            return response.json()
+        return _parse_json(response)
 
     async def get_user_repositories(
         self, access_token: str, page: int = 1, per_page: int = 100
@@ -109,29 +395,24 @@ class GitHubService:
         Raises:
             HTTPException: If request fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.api_base_url}/user/repos",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github+json",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-                params={
-                    "page": page,
-                    "per_page": min(per_page, 100),
-                    "sort": "updated",
-                    "direction": "desc",
-                },
-            )
+        status_code, data = await self._get_json(
+            "/user/repos",
+            access_token,
+            params={
+                "page": page,
+                "per_page": min(per_page, 100),
+                "sort": "updated",
+                "direction": "desc",
+            },
+        )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to fetch repositories from GitHub",
-                )
+        if status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to fetch repositories from GitHub",
+            )
 
-            return response.json()
+        return data
 
     async def get_repository(
         self, access_token: str, owner: str, repo: str
@@ -150,28 +431,23 @@ class GitHubService:
         Raises:
             HTTPException: If request fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.api_base_url}/repos/{owner}/{repo}",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github+json",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-            )
+        status_code, data = await self._get_json(
+            f"/repos/{owner}/{repo}",
+            access_token,
+        )
 
-            if response.status_code == 404:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Repository not found",
-                )
-            elif response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to fetch repository from GitHub",
-                )
+        if status_code == 404:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Repository not found",
+            )
+        elif status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to fetch repository from GitHub",
+            )
 
-            return response.json()
+        return data
 
     async def get_pull_requests(
         self,
@@ -199,30 +475,25 @@ class GitHubService:
         Raises:
             HTTPException: If request fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.api_base_url}/repos/{owner}/{repo}/pulls",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github+json",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-                params={
-                    "state": state,
-                    "page": page,
-                    "per_page": min(per_page, 100),
-                    "sort": "updated",
-                    "direction": "desc",
-                },
-            )
+        status_code, data = await self._get_json(
+            f"/repos/{owner}/{repo}/pulls",
+            access_token,
+            params={
+                "state": state,
+                "page": page,
+                "per_page": min(per_page, 100),
+                "sort": "updated",
+                "direction": "desc",
+            },
+        )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to fetch pull requests from GitHub",
-                )
+        if status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to fetch pull requests from GitHub",
+            )
 
-            return response.json()
+        return data
 
     async def get_pull_request(
         self, access_token: str, owner: str, repo: str, pull_number: int
@@ -242,28 +513,23 @@ class GitHubService:
         Raises:
             HTTPException: If request fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.api_base_url}/repos/{owner}/{repo}/pulls/{pull_number}",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github+json",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-            )
+        status_code, data = await self._get_json(
+            f"/repos/{owner}/{repo}/pulls/{pull_number}",
+            access_token,
+        )
 
-            if response.status_code == 404:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Pull request not found",
-                )
-            elif response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to fetch pull request from GitHub",
-                )
+        if status_code == 404:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Pull request not found",
+            )
+        elif status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to fetch pull request from GitHub",
+            )
 
-            return response.json()
+        return data
 
     async def get_pull_request_diff(
         self, access_token: str, owner: str, repo: str, pull_number: int
@@ -283,23 +549,60 @@ class GitHubService:
         Raises:
             HTTPException: If request fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.api_base_url}/repos/{owner}/{repo}/pulls/{pull_number}",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github.v3.diff",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-            )
+        async with aclosing(
+            self.iter_pull_request_diff(access_token, owner, repo, pull_number)
+        ) as stream:
+            chunks = [chunk async for chunk in stream]
+        return b"".join(chunks).decode("utf-8", errors="replace")
+
+    async def iter_pull_request_diff(
+        self, access_token: str, owner: str, repo: str, pull_number: int
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream diff content for a pull request in chunks.
+
+        Lets callers process large diffs without holding the whole body
+        in memory. Callers that may stop early should wrap the generator in
+        contextlib.aclosing() so the HTTP stream is closed promptly.
+
+        Args:
+            access_token: GitHub access token
+            owner: Repository owner (username or org)
+            repo: Repository name
+            pull_number: Pull request number
+
+        Yields:
+            Raw diff bytes, up to DIFF_CHUNK_SIZE at a time
+
+        Raises:
+            HTTPException: If request fails
+        """
+        token_key = self._token_key(access_token)
+        await self._wait_for_rate_limit(token_key)
+
+        request = self.client.build_request(
+            "GET",
+            f"/repos/{owner}/{repo}/pulls/{pull_number}",
+            headers={**self._auth(access_token), **_DIFF_HEADERS},
+        )
+        # Hold a concurrency slot only until the response headers arrive; the
+        # body is then read at the consumer's pace without blocking others
+        async with self._rl_semaphore:
+            response = await self.client.send(request, stream=True)
+
+        try:
+            self._update_rate_limit(response, token_key)
 
             if response.status_code != 200:
                 raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
+                    status_code=response.status_code,
                     detail="Failed to fetch pull request diff from GitHub",
                 )
 
-            return response.text
+            async for chunk in response.aiter_bytes(DIFF_CHUNK_SIZE):
+                yield chunk
+        finally:
+            await response.aclose()
 
     async def get_pull_request_files(
         self, access_token: str, owner: str, repo: str, pull_number: int
@@ -319,23 +622,18 @@ class GitHubService:
         Raises:
             HTTPException: If request fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.api_base_url}/repos/{owner}/{repo}/pulls/{pull_number}/files",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github+json",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-            )
+        status_code, data = await self._get_json(
+            f"/repos/{owner}/{repo}/pulls/{pull_number}/files",
+            access_token,
+        )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to fetch pull request files from GitHub",
-                )
+        if status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to fetch pull request files from GitHub",
+            )
 
-            return response.json()
+        return data
 
     async def create_webhook(
         self, access_token: str, owner: str, repo: str, webhook_url: str
@@ -355,44 +653,40 @@ class GitHubService:
         Raises:
             HTTPException: If request fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.api_base_url}/repos/{owner}/{repo}/hooks",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github+json",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-                json={
-                    "name": "web",
-                    "active": True,
-                    "events": [
-                        "pull_request",
-                        "pull_request_review",
-                        "pull_request_review_comment",
-                    ],
-                    "config": {
-                        "url": webhook_url,
-                        "content_type": "json",
-                        "secret": self.webhook_secret,
-                        "insecure_ssl": "0",
-                    },
+        response = await self._request(
+            "POST",
+            f"/repos/{owner}/{repo}/hooks",
+            access_token,
+            json={
+                "name": "web",
+                "active": True,
+                "events": [
+                    "pull_request",
+                    "pull_request_review",
+                    "pull_request_review_comment",
+                ],
+                "config": {
+                    "url": webhook_url,
+                    "content_type": "json",
+                    "secret": self.webhook_secret,
+                    "insecure_ssl": "0",
                 },
-            )
+            },
+        )
 
-            if response.status_code == 422:
-                # Webhook might already exist
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail="Webhook already exists for this repository",
-                )
-            elif response.status_code not in [200, 201]:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to create webhook",
-                )
+        if response.status_code == 422:
+            # Webhook might already exist
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Webhook already exists for this repository",
+            )
+        elif response.status_code not in [200, 201]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to create webhook",
+            )
 
-            return response.json()
+        return _parse_json(response)
 
     async def delete_webhook(
         self, access_token: str, owner: str, repo: str, webhook_id: int
@@ -409,26 +703,22 @@ class GitHubService:
         Raises:
             HTTPException: If request fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                f"{self.api_base_url}/repos/{owner}/{repo}/hooks/{webhook_id}",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github+json",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-            )
+        response = await self._request(
+            "DELETE",
+            f"/repos/{owner}/{repo}/hooks/{webhook_id}",
+            access_token,
+        )
 
-            if response.status_code == 404:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Webhook not found",
-                )
-            elif response.status_code != 204:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to delete webhook",
-                )
+        if response.status_code == 404:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Webhook not found",
+            )
+        elif response.status_code != 204:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to delete webhook",
+            )
 
     def verify_webhook_signature(self, payload: bytes, signature: str) -> bool:
         """
@@ -448,13 +738,19 @@ class GitHubService:
         if not signature.startswith("sha256="):
             return False
 
-        expected_signature = signature[7:]  # Remove "sha256=" prefix
+        # Reject malformed signatures before hashing a possibly large payload
+        signature_hex = signature[7:]  # Remove "sha256=" prefix
+        if len(signature_hex) != 64:
+            return False
 
-        # Calculate HMAC
-        mac = hmac.new(
-            self.webhook_secret.encode("utf-8"), msg=payload, digestmod=hashlib.sha256
-        )
-        computed_signature = mac.hexdigest()
+        try:
+            expected_signature = binascii.unhexlify(signature_hex)
+        except ValueError:
+            # Non-ASCII header text raises a plain ValueError, not binascii.Error
+            return False
+
+        # Calculate HMAC in a single call, without an intermediate HMAC object
+        computed_signature = hmac.digest(self._webhook_secret_bytes, payload, "sha256")
 
         # Compare signatures securely
         return hmac.compare_digest(computed_signature, expected_signature)
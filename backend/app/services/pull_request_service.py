@@ -2,17 +2,259 @@
 Pull request service for processing GitHub PR events.
 """
 
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, List, Optional, Set, Tuple
+from sqlalchemy import and_, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
+from app.models.base import utcnow
 from app.models.user import User
 from app.models.repository import Repository
 from app.models.pull_request import PullRequest
 from app.schemas.webhook import PullRequestWebhookPayload
 from app.services.github_service import github_service
 
+logger = logging.getLogger(__name__)
+
+# How long the in-memory set of monitored repositories is trusted before
+# it is reloaded (picks up repositories added by other workers)
+KNOWN_REPOS_REFRESH_SECONDS = 60
+
+# Dialect-specific INSERT constructs supporting ON CONFLICT DO UPDATE;
+# other dialects fall back to a lookup followed by an insert or update
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
 
 class PullRequestService:
     """Service for processing pull request events from webhooks."""
 
+    def __init__(self):
+        """Initialize service; the monitored-repository set loads on startup."""
+        self._known_repo_github_ids: Optional[Set[int]] = None
+        self._known_repos_loaded_at = 0.0
+        # (github_id, added) changes made while a reload query is running;
+        # None when no reload is in flight
+        self._pending_repo_changes: Optional[List[Tuple[int, bool]]] = None
+
+    def load_known_repositories(self, db: Session) -> None:
+        """
+        Load GitHub IDs of all monitored repositories into memory.
+
+        Args:
+            db: Database session
+        """
+        self._known_repo_github_ids = self._select_known_repositories(db)
+        self._known_repos_loaded_at = time.monotonic()
+
+    def _select_known_repositories(self, db: Session) -> Set[int]:
+        """
+        Query GitHub IDs of all monitored repositories.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Set of repository GitHub IDs
+        """
+        return set(db.scalars(select(Repository.github_id)).all())
+
+    async def _reload_known_repositories(self, db: Session) -> None:
+        """
+        Refresh the monitored-repository set without losing concurrent changes.
+
+        The refresh time is stamped before the query so webhooks arriving
+        meanwhile keep using the current set instead of starting their own
+        reload. Adds and discards made while the query runs are replayed
+        onto the new set, since the snapshot may predate them.
+
+        Args:
+            db: Database session
+        """
+        self._known_repos_loaded_at = time.monotonic()
+        self._pending_repo_changes = pending = []
+        try:
+            github_ids = await asyncio.to_thread(self._select_known_repositories, db)
+        finally:
+            self._pending_repo_changes = None
+
+        for github_id, added in pending:
+            if added:
+                github_ids.add(github_id)
+            else:
+                github_ids.discard(github_id)
+        self._known_repo_github_ids = github_ids
+
+    def add_known_repository(self, github_id: int) -> None:
+        """
+        Record a newly monitored repository.
+
+        Args:
+            github_id: GitHub repository ID
+        """
+        if self._known_repo_github_ids is not None:
+            self._known_repo_github_ids.add(github_id)
+        if self._pending_repo_changes is not None:
+            self._pending_repo_changes.append((github_id, True))
+
+    def discard_known_repository(self, github_id: int) -> None:
+        """
+        Forget a repository that is no longer monitored.
+
+        Args:
+            github_id: GitHub repository ID
+        """
+        if self._known_repo_github_ids is not None:
+            self._known_repo_github_ids.discard(github_id)
+        if self._pending_repo_changes is not None:
+            self._pending_repo_changes.append((github_id, False))
+
+    async def _is_known_repository(self, github_id: int, db: Session) -> bool:
+        """
+        Check whether webhooks for a repository should be processed.
+
+        Lets events for unmonitored repositories be dropped without a
+        database round trip. Always True until the set has been loaded.
+
+        Args:
+            github_id: GitHub repository ID
+            db: Database session
+
+        Returns:
+            True if the repository may be monitored
+        """
+        if self._known_repo_github_ids is None:
+            return True
+
+        if time.monotonic() - self._known_repos_loaded_at > KNOWN_REPOS_REFRESH_SECONDS:
+            await self._reload_known_repositories(db)
+
+        return github_id in self._known_repo_github_ids
+
+    def _find_repository_and_pr(
+        self, webhook_data: PullRequestWebhookPayload, db: Session
+    ) -> Tuple[Optional[Repository], Optional[PullRequest]]:
+        """
+        Look up the monitored repository and existing PR in one query.
+
+        Args:
+            webhook_data: Validated webhook payload
+            db: Database session
+
+        Returns:
+            Tuple of (repository or None, pull request or None)
+        """
+        row = (
+            db.query(Repository, PullRequest)
+            .outerjoin(
+                PullRequest,
+                and_(
+                    PullRequest.repository_id == Repository.id,
+                    PullRequest.pr_number == webhook_data.number,
+                ),
+            )
+            .filter(Repository.github_id == webhook_data.repository.id)
+            .first()
+        )
+
+        if row is None:
+            return None, None
+
+        return row[0], row[1]
+
+    def _upsert_pull_request(
+        self,
+        repository: Repository,
+        webhook_data: PullRequestWebhookPayload,
+        db: Session,
+    ) -> PullRequest:
+        """
+        Insert the PR or update the existing row in a single statement.
+
+        Args:
+            repository: Repository model the PR belongs to
+            webhook_data: Validated webhook payload
+            db: Database session
+
+        Returns:
+            PullRequest: Inserted or updated pull request model
+        """
+        pr_data = webhook_data.pull_request
+        fields = {
+            "title": pr_data.title,
+            "description": pr_data.body,
+            "author": pr_data.user.get("login"),
+            "state": pr_data.state,
+            "base_branch": pr_data.base.get("ref"),
+            "head_branch": pr_data.head.get("ref"),
+            "files_changed": pr_data.changed_files,
+            "additions": pr_data.additions,
+            "deletions": pr_data.deletions,
+            "github_url": pr_data.html_url,
+        }
+
+        insert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+        if insert is None:
+            return self._merge_pull_request(repository, webhook_data.number, fields, db)
+
+        stmt = (
+            insert(PullRequest)
+            .values(
+                repository_id=repository.id,
+                pr_number=webhook_data.number,
+                **fields,
+            )
+            .on_conflict_do_update(
+                index_elements=["repository_id", "pr_number"],
+                set_={**fields, "updated_at": utcnow()},
+            )
+            .returning(PullRequest)
+        )
+
+        return db.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).one()
+
+    def _merge_pull_request(
+        self, repository: Repository, pr_number: int, fields: dict, db: Session
+    ) -> PullRequest:
+        """
+        Insert or update the PR with a lookup, for dialects without ON CONFLICT.
+
+        Args:
+            repository: Repository model the PR belongs to
+            pr_number: PR number within the repository
+            fields: Column values to write
+            db: Database session
+
+        Returns:
+            PullRequest: Inserted or updated pull request model
+        """
+        pull_request = db.scalars(
+            select(PullRequest).where(
+                and_(
+                    PullRequest.repository_id == repository.id,
+                    PullRequest.pr_number == pr_number,
+                )
+            )
+        ).first()
+
+        if pull_request is None:
+            pull_request = PullRequest(
+                repository_id=repository.id, pr_number=pr_number
+            )
+            db.add(pull_request)
+
+        for key, value in fields.items():
+            setattr(pull_request, key, value)
+
+        db.flush()
+        return pull_request
+
     async def process_pr_opened(
         self, webhook_data: PullRequestWebhookPayload, db: Session
     ) -> PullRequest:
@@ -28,75 +270,46 @@ class PullRequestService:
         Returns:
             PullRequest: Created/updated pull request model
         """
-        # Find repository in database
-        repository = (
-            db.query(Repository)
-            .filter(Repository.github_id == webhook_data.repository.id)
-            .first()
+        if not await self._is_known_repository(webhook_data.repository.id, db):
+            logger.info(
+                "Ignoring event for unmonitored repository %s",
+                webhook_data.repository.full_name,
+            )
+            return None
+
+        # Find repository in database (off the event loop)
+        repository, _ = await asyncio.to_thread(
+            self._find_repository_and_pr, webhook_data, db
         )
 
         if not repository:
             # Repository not being monitored, skip processing
-            print(
-                f"Repository {webhook_data.repository.full_name} not found in database"
+            logger.warning(
+                "Repository %s not found in database",
+                webhook_data.repository.full_name,
             )
             return None
 
-        # Check if PR already exists
-        pull_request = (
-            db.query(PullRequest)
-            .filter(
-                PullRequest.repository_id == repository.id,
-                PullRequest.pr_number == webhook_data.number,
-            )
-            .first()
-        )
-
-        pr_data = webhook_data.pull_request
+        def persist():
+            # Create the PR or update the existing record
+            pull_request = self._upsert_pull_request(repository, webhook_data, db)
+            db.commit()
+            db.refresh(pull_request)
+            return pull_request, repository.user
 
-        if pull_request:
-            # Update existing PR
-            pull_request.title = pr_data.title
-            pull_request.description = pr_data.body
-            pull_request.author = pr_data.user.get("login")
-            pull_request.state = pr_data.state
-            pull_request.base_branch = pr_data.base.get("ref")
-            pull_request.head_branch = pr_data.head.get("ref")
-            pull_request.files_changed = pr_data.changed_files
-            pull_request.additions = pr_data.additions
-            pull_request.deletions = pr_data.deletions
-            pull_request.github_url = pr_data.html_url
-        else:
-            # Create new PR
-            pull_request = PullRequest(
-                repository_id=repository.id,
-                pr_number=webhook_data.number,
-                title=pr_data.title,
-                description=pr_data.body,
-                author=pr_data.user.get("login"),
-                state=pr_data.state,
-                base_branch=pr_data.base.get("ref"),
-                head_branch=pr_data.head.get("ref"),
-                files_changed=pr_data.changed_files,
-                additions=pr_data.additions,
-                deletions=pr_data.deletions,
-                github_url=pr_data.html_url,
-            )
-            db.add(pull_request)
-
-        db.commit()
-        db.refresh(pull_request)
+        pull_request, user = await asyncio.to_thread(persist)
 
         # Trigger automatic code review
         try:
             # Import here to avoid circular dependency
             from app.services.review_service import review_service
 
-            user = repository.user  # Get user from repository relationship
             await review_service.create_review(pull_request, user, db)
-            print(f"PR #{pull_request.pr_number} stored. Code review triggered.")
-        except Exception as e:
-            print(f"Failed to trigger review for PR #{pull_request.pr_number}: {str(e)}")
+            logger.info("PR #%s stored. Code review triggered.", pull_request.pr_number)
+        except Exception:
+            logger.exception(
+                "Failed to trigger review for PR #%s", pull_request.pr_number
+            )
 
         return pull_request
 
@@ -115,55 +328,58 @@ class PullRequestService:
         Returns:
             PullRequest: Updated pull request model
         """
-        # Find repository
-        repository = (
-            db.query(Repository)
-            .filter(Repository.github_id == webhook_data.repository.id)
-            .first()
+        if not await self._is_known_repository(webhook_data.repository.id, db):
+            logger.info(
+                "Ignoring event for unmonitored repository %s",
+                webhook_data.repository.full_name,
+            )
+            return None
+
+        # Find repository and PR (off the event loop)
+        repository, pull_request = await asyncio.to_thread(
+            self._find_repository_and_pr, webhook_data, db
         )
 
         if not repository:
-            print(
-                f"Repository {webhook_data.repository.full_name} not found in database"
+            logger.warning(
+                "Repository %s not found in database",
+                webhook_data.repository.full_name,
             )
             return None
 
-        # Find PR
-        pull_request = (
-            db.query(PullRequest)
-            .filter(
-                PullRequest.repository_id == repository.id,
-                PullRequest.pr_number == webhook_data.number,
-            )
-            .first()
-        )
-
         if not pull_request:
             # PR doesn't exist, create it
             return await self.process_pr_opened(webhook_data, db)
 
-        # Update PR with latest data
-        pr_data = webhook_data.pull_request
-        pull_request.title = pr_data.title
-        pull_request.description = pr_data.body
-        pull_request.state = pr_data.state
-        pull_request.files_changed = pr_data.changed_files
-        pull_request.additions = pr_data.additions
-        pull_request.deletions = pr_data.deletions
+        def persist():
+            # Update PR with latest data
+            pr_data = webhook_data.pull_request
+            pull_request.title = pr_data.title
+            pull_request.description = pr_data.body
+            pull_request.state = pr_data.state
+            pull_request.files_changed = pr_data.changed_files
+            pull_request.additions = pr_data.additions
+            pull_request.deletions = pr_data.deletions
+
+            db.commit()
+            db.refresh(pull_request)
+            return repository.user
 
-        db.commit()
-        db.refresh(pull_request)
+        user = await asyncio.to_thread(persist)
 
         # Trigger new code review for updated PR
         try:
             # Import here to avoid circular dependency
             from app.services.review_service import review_service
 
-            user = repository.user  # Get user from repository relationship
             await review_service.create_review(pull_request, user, db)
-            print(f"PR #{pull_request.pr_number} updated. New code review triggered.")
-        except Exception as e:
-            print(f"Failed to trigger review for updated PR #{pull_request.pr_number}: {str(e)}")
+            logger.info(
+                "PR #%s updated. New code review triggered.", pull_request.pr_number
+            )
+        except Exception:
+            logger.exception(
+                "Failed to trigger review for updated PR #%s", pull_request.pr_number
+            )
 
         return pull_request
 
@@ -182,44 +398,40 @@ class PullRequestService:
         Returns:
             PullRequest: Updated pull request model
         """
-        # Find repository
-        repository = (
-            db.query(Repository)
-            .filter(Repository.github_id == webhook_data.repository.id)
-            .first()
+        if not await self._is_known_repository(webhook_data.repository.id, db):
+            logger.info(
+                "Ignoring event for unmonitored repository %s",
+                webhook_data.repository.full_name,
+            )
+            return None
+
+        # Find repository and PR (off the event loop)
+        repository, pull_request = await asyncio.to_thread(
+            self._find_repository_and_pr, webhook_data, db
         )
 
         if not repository:
-            print(
-                f"Repository {webhook_data.repository.full_name} not found in database"
+            logger.warning(
+                "Repository %s not found in database",
+                webhook_data.repository.full_name,
             )
             return None
 
-        # Find PR
-        pull_request = (
-            db.query(PullRequest)
-            .filter(
-                PullRequest.repository_id == repository.id,
-                PullRequest.pr_number == webhook_data.number,
-            )
-            .first()
-        )
-
         if not pull_request:
             # PR doesn't exist, create it as closed
             return await self.process_pr_opened(webhook_data, db)
 
         # Update PR state
-        pr_data = webhook_data.pull_request
-        if pr_data.merged_at:
-            pull_request.state = "merged"
-        else:
-            pull_request.state = "closed"
+        new_state = "merged" if webhook_data.pull_request.merged_at else "closed"
+
+        def persist():
+            pull_request.state = new_state
+            db.commit()
 
-        db.commit()
-        db.refresh(pull_request)
+        await asyncio.to_thread(persist)
 
-        print(f"PR #{pull_request.pr_number} marked as {pull_request.state}")
+        # No refresh: nothing reads the row back, so avoid reloading it
+        logger.info("PR #%s marked as %s", webhook_data.number, new_state)
 
         return pull_request
 
@@ -237,7 +449,7 @@ class PullRequestService:
         Returns:
             Diff content as string
         """
-        owner, repo_name = repository.full_name.split("/")
+        owner, repo_name = repository.owner_and_repo
 
         diff = await github_service.get_pull_request_diff(
             access_token=user.access_token,
@@ -248,6 +460,29 @@ class PullRequestService:
 
         return diff
 
+    def iter_pr_diff(
+        self, repository: Repository, pr_number: int, user: User
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream PR diff from GitHub in raw chunks.
+
+        Args:
+            repository: Repository model
+            pr_number: Pull request number
+            user: User model (for access token)
+
+        Returns:
+            Async iterator over diff body chunks
+        """
+        owner, repo_name = repository.owner_and_repo
+
+        return github_service.iter_pull_request_diff(
+            access_token=user.access_token,
+            owner=owner,
+            repo=repo_name,
+            pull_number=pr_number,
+        )
+
     async def get_pr_files(
         self, repository: Repository, pr_number: int, user: User
     ) -> list:
@@ -262,7 +497,7 @@ class PullRequestService:
         Returns:
             List of file change dictionaries
         """
-        owner, repo_name = repository.full_name.split("/")
+        owner, repo_name = repository.owner_and_repo
 
         files = await github_service.get_pull_request_files(
             access_token=user.access_token,
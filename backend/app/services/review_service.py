@@ -3,9 +3,19 @@ Review service for orchestrating code analysis.
 """
 
 import asyncio
+import logging
+import os
+import time
+from collections import Counter
+from contextlib import aclosing
 from datetime import datetime
-from typing import List, Dict, Any
-from sqlalchemy.orm import Session
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+from uuid import UUID
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, sessionmaker
+from app.database import SessionLocal
+from app.models.base import utcnow
 from app.models.review import Review
 from app.models.finding import Finding
 from app.models.pull_request import PullRequest
@@ -13,20 +23,100 @@ from app.models.user import User
 from app.services.github_service import github_service
 from app.services.pull_request_service import pull_request_service
 from app.services.analysis.base import (
+    AnalyzerResult,
     create_temp_workspace,
     cleanup_workspace,
     write_files_to_workspace,
-    extract_python_files_from_diff,
+    extract_python_files_from_diff_stream,
+    is_test_file,
 )
 from app.services.analysis.security import security_analyzer
 from app.services.analysis.quality import quality_analyzer
 from app.services.analysis.complexity import complexity_analyzer
 from app.services.analysis.ai_reviewer import ai_reviewer
 
+logger = logging.getLogger(__name__)
+
+# Reviews waiting for a worker before create_review applies backpressure
+REVIEW_QUEUE_MAX_SIZE = 64
+
+# Fixed summaries for reviews with nothing to report
+CLEAN_SUMMARY = "Great work! No issues found in this pull request."
+NO_PYTHON_FILES_SUMMARY = "No Python files found in this pull request."
+SHUTDOWN_SUMMARY = "Review cancelled: the service shut down before it finished."
+
+# Changes with fewer added lines than this skip complexity analysis; Radon's
+# startup cost dominates and tiny changes rarely hold complex functions
+SMALL_CHANGE_MAX_LINES = 20
+
 
 class ReviewService:
     """Service for orchestrating code review process."""
 
+    def __init__(self, session_factory: sessionmaker = SessionLocal):
+        """
+        Initialize review service; workers start with the application.
+
+        Args:
+            session_factory: Factory for the sessions background analysis
+                opens (independent of any request-scoped session)
+        """
+        self._session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        # Strong references to fallback tasks so they are not GC'd mid-run
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    async def startup(self, num_workers: Optional[int] = None) -> None:
+        """
+        Start the bounded review queue and its worker pool.
+
+        Analyzers are CPU-bound subprocesses, so the pool defaults to one
+        worker per CPU.
+
+        Args:
+            num_workers: Number of worker coroutines (defaults to CPU count)
+        """
+        if self._queue is not None:
+            return
+
+        self._queue = asyncio.Queue(maxsize=REVIEW_QUEUE_MAX_SIZE)
+        self._workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(num_workers or os.cpu_count() or 1)
+        ]
+
+    async def shutdown(self) -> None:
+        """
+        Stop the worker pool (called on application shutdown).
+
+        Reviews being analyzed are cancelled and record a failed status;
+        reviews still queued are marked failed so none stay pending.
+        """
+        running = [*self._workers, *self._background_tasks]
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        self._workers = []
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                review_id, _, _ = self._queue.get_nowait()
+                self._mark_failed(review_id, None, SHUTDOWN_SUMMARY)
+                self._queue.task_done()
+        self._queue = None
+
+    async def _worker(self) -> None:
+        """Run queued reviews one at a time until cancelled."""
+        while True:
+            review_id, pull_request_id, user_id = await self._queue.get()
+            try:
+                await self._run_analysis(review_id, pull_request_id, user_id)
+            except Exception:
+                logger.exception("Review worker error for review %s", review_id)
+            finally:
+                self._queue.task_done()
+
     async def create_review(
         self, pull_request: PullRequest, user: User, db: Session
     ) -> Review:
@@ -53,110 +143,126 @@ class ReviewService:
         db.commit()
         db.refresh(review)
 
-        # Run analysis asynchronously (don't await - let it run in background)
-        asyncio.create_task(self._run_analysis(review, pull_request, user, db))
+        # Background analysis opens its own sessions; only IDs cross over so
+        # the request-scoped session can close as soon as the handler returns
+        job = (review.id, pull_request.id, user.id)
+
+        # Queue analysis for the worker pool (blocks while the queue is full)
+        if self._queue is not None:
+            await self._queue.put(job)
+        else:
+            # Workers not started (e.g. no lifespan); run as a tracked task
+            task = asyncio.create_task(self._run_analysis(*job))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
 
         return review
 
     async def _run_analysis(
-        self, review: Review, pull_request: PullRequest, user: User, db: Session
+        self, review_id: UUID, pull_request_id: UUID, user_id: UUID
     ):
         """
         Run analysis pipeline in background.
 
+        The review is marked in_progress as soon as analysis starts.
+        Database sessions are opened only around that initial load and the
+        final write, so no connection is held while analyzers run.
+
         Args:
-            review: Review model
-            pull_request: PullRequest model
-            user: User model
-            db: Database session
+            review_id: Review ID
+            pull_request_id: PullRequest ID
+            user_id: User ID (for GitHub access token)
         """
         workspace = None
+        started_at = utcnow()
+        # Wall-clock timestamps are stored; durations use the monotonic clock
+        start_time = time.monotonic()
 
         try:
-            # Update status to in_progress
-            review.status = "in_progress"
-            review.started_at = datetime.utcnow()
-            db.commit()
-
-            # Get repository
-            repository = pull_request.repository
-
-            # Fetch PR diff from GitHub
-            diff = await pull_request_service.get_pr_diff(
-                repository, pull_request.pr_number, user
-            )
-
-            # Extract Python files from diff
-            python_files = extract_python_files_from_diff(diff)
-
-            if not python_files:
-                # No Python files to analyze
-                review.status = "completed"
-                review.completed_at = datetime.utcnow()
-                review.summary = "No Python files found in this pull request."
-                review.overall_score = 100
+            # Mark the review as started, then load everything the analysis
+            # needs and release the connection. The commit comes first so the
+            # rows loaded below are not expired when the session closes.
+            with self._session_factory() as db:
+                review = db.get(Review, review_id)
+                review.status = "in_progress"
+                review.started_at = started_at
                 db.commit()
-                return
-
-            # Create temporary workspace
-            workspace = create_temp_workspace()
-            write_files_to_workspace(python_files, workspace)
-
-            # Prepare PR context for AI reviewer
-            pr_context = {
-                "title": pull_request.title,
-                "description": pull_request.description,
-                "author": pull_request.author,
-                "base_branch": pull_request.base_branch,
-                "head_branch": pull_request.head_branch,
-            }
 
-            # Run analyzers in parallel (including AI reviewer)
-            results = await asyncio.gather(
-                security_analyzer.analyze(python_files, workspace),
-                quality_analyzer.analyze(python_files, workspace),
-                complexity_analyzer.analyze(python_files, workspace),
-                ai_reviewer.analyze(python_files, workspace, pr_context),
-                return_exceptions=True,
-            )
+                pull_request = db.get(PullRequest, pull_request_id)
+                repository = pull_request.repository
+                user = db.get(User, user_id)
+
+                pr_number = pull_request.pr_number
+                # Prepare PR context for AI reviewer
+                pr_context = {
+                    "title": pull_request.title,
+                    "description": pull_request.description,
+                    "author": pull_request.author,
+                    "base_branch": pull_request.base_branch,
+                    "head_branch": pull_request.head_branch,
+                }
+
+            # Stream the PR diff from GitHub, keeping only Python files; the
+            # stream is closed even if parsing fails or the task is cancelled
+            async with aclosing(
+                pull_request_service.iter_pr_diff(repository, pr_number, user)
+            ) as diff_chunks:
+                python_files = await extract_python_files_from_diff_stream(
+                    diff_chunks
+                )
 
-            # Process results
             all_findings = []
-            for result in results:
-                if isinstance(result, Exception):
-                    print(f"Analyzer error: {str(result)}")
-                    continue
+            if python_files:
+                # Create temporary workspace
+                workspace = create_temp_workspace()
+                write_files_to_workspace(python_files, workspace)
+
+                # Run analyzers in parallel (including AI reviewer)
+                results = await self._run_analyzers(
+                    python_files, workspace, pr_context
+                )
+
+                # Process results
+                for result in results:
+                    if not result.success:
+                        logger.warning(
+                            "Analyzer %s failed for review %s: %s",
+                            result.tool,
+                            review_id,
+                            result.error,
+                        )
+                        continue
 
-                if result.success:
                     all_findings.extend(result.findings)
 
-            # Store findings in database
-            critical_count = 0
-            warning_count = 0
-            info_count = 0
-
-            for finding_data in all_findings:
-                finding = Finding(
-                    review_id=review.id,
-                    category=finding_data.get("category", "unknown"),
-                    severity=finding_data.get("severity", "info"),
-                    title=finding_data.get("title", ""),
-                    description=finding_data.get("description"),
-                    file_path=finding_data.get("file_path"),
-                    line_number=finding_data.get("line_number"),
-                    code_snippet=finding_data.get("code_snippet"),
-                    suggestion=finding_data.get("suggestion"),
-                    tool_source=finding_data.get("tool_source"),
+            # Build finding rows, tallying severities and categories in the
+            # same pass
+            severity_counts = Counter()
+            category_counts = Counter()
+
+            rows = []
+            for finding in all_findings:
+                severity_counts[finding.severity] += 1
+                category_counts[finding.category] += 1
+                rows.append(
+                    {
+                        "review_id": review_id,
+                        "category": finding.category,
+                        "severity": finding.severity,
+                        "title": finding.title,
+                        "description": finding.description,
+                        "file_path": finding.file_path,
+                        "line_number": finding.line_number,
+                        "code_snippet": finding.code_snippet,
+                        "suggestion": finding.suggestion,
+                        "tool_source": finding.tool_source,
+                    }
                 )
-                db.add(finding)
 
-                # Count by severity
-                if finding.severity == "critical":
-                    critical_count += 1
-                elif finding.severity == "warning":
-                    warning_count += 1
-                else:
-                    info_count += 1
+            # Anything not critical or warning counts as info
+            critical_count = severity_counts["critical"]
+            warning_count = severity_counts["warning"]
+            info_count = len(rows) - critical_count - warning_count
 
             # Calculate overall score
             overall_score = self._calculate_score(
@@ -164,34 +270,141 @@ class ReviewService:
             )
 
             # Generate summary
-            summary = self._generate_summary(
-                critical_count, warning_count, info_count, all_findings
-            )
+            if python_files:
+                summary = self._generate_summary(
+                    critical_count, warning_count, info_count, category_counts
+                )
+            else:
+                summary = NO_PYTHON_FILES_SUMMARY
 
-            # Update review
-            review.status = "completed"
-            review.completed_at = datetime.utcnow()
-            review.overall_score = overall_score
-            review.critical_count = critical_count
-            review.warning_count = warning_count
-            review.info_count = info_count
-            review.summary = summary
+            # Store findings and results in one transaction
+            with self._session_factory() as db:
+                # Insert all findings in one executemany batch
+                if rows:
+                    db.execute(insert(Finding), rows)
 
-            db.commit()
+                review = db.get(Review, review_id)
+                review.status = "completed"
+                review.started_at = started_at
+                review.completed_at = utcnow()
+                review.overall_score = overall_score
+                review.critical_count = critical_count
+                review.warning_count = warning_count
+                review.info_count = info_count
+                review.summary = summary
+
+                db.commit()
+
+            logger.info(
+                "Review %s completed in %.2fs with %d finding(s)",
+                review_id,
+                time.monotonic() - start_time,
+                len(rows),
+            )
+
+        except asyncio.CancelledError:
+            # Shutdown cancelled the analysis; record it before unwinding
+            self._mark_failed(review_id, started_at, SHUTDOWN_SUMMARY)
+            logger.warning("Review %s cancelled by shutdown", review_id)
+            raise
 
         except Exception as e:
-            # Mark review as failed
-            review.status = "failed"
-            review.completed_at = datetime.utcnow()
-            review.summary = f"Review failed: {str(e)}"
-            db.commit()
-            print(f"Review failed: {str(e)}")
+            # Mark review as failed; an uncommitted session above is rolled
+            # back on close, so no partial findings are left behind
+            self._mark_failed(review_id, started_at, f"Review failed: {str(e)}")
+            logger.exception(
+                "Review %s failed after %.2fs",
+                review_id,
+                time.monotonic() - start_time,
+            )
 
         finally:
             # Cleanup workspace
             if workspace:
                 cleanup_workspace(workspace)
 
+    def _mark_failed(
+        self, review_id: UUID, started_at: Optional[datetime], summary: str
+    ) -> None:
+        """
+        Record a review as failed in its own session.
+
+        Args:
+            review_id: Review ID
+            started_at: When analysis started (None if it never did)
+            summary: Failure summary shown to the user
+        """
+        with self._session_factory() as db:
+            review = db.get(Review, review_id)
+            review.status = "failed"
+            review.started_at = started_at
+            review.completed_at = utcnow()
+            review.summary = summary
+            db.commit()
+
+    async def _run_analyzers(
+        self,
+        python_files: Dict[str, str],
+        workspace: Path,
+        pr_context: Dict[str, Any],
+    ) -> List[AnalyzerResult]:
+        """
+        Run all analyzers concurrently, failing fast on the first error.
+
+        Every analyzer sees all Python files except complexity, which skips
+        test modules and is skipped entirely for small changes.
+
+        If any analyzer raises, the others are cancelled (killing their
+        tool subprocesses) instead of running on to their timeouts.
+
+        Args:
+            python_files: Dictionary of filename -> content
+            workspace: Path to workspace directory
+            pr_context: PR metadata for the AI reviewer
+
+        Returns:
+            List[AnalyzerResult]: Results in analyzer order
+
+        Raises:
+            Exception: The first exception raised by an analyzer
+        """
+        total_lines = sum(
+            content.count("\n") + 1 for content in python_files.values()
+        )
+
+        if total_lines < SMALL_CHANGE_MAX_LINES:
+            source_files = {}
+        else:
+            # Complexity metrics on test modules are not actionable
+            source_files = {
+                filepath: content
+                for filepath, content in python_files.items()
+                if not is_test_file(filepath)
+            }
+
+        tasks = [
+            asyncio.create_task(security_analyzer.analyze(python_files, workspace)),
+            asyncio.create_task(quality_analyzer.analyze(python_files, workspace)),
+            asyncio.create_task(complexity_analyzer.analyze(source_files, workspace)),
+            asyncio.create_task(
+                ai_reviewer.analyze(python_files, workspace, pr_context)
+            ),
+        ]
+
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+        finally:
+            # Also covers this coroutine itself being cancelled
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        return [task.result() for task in tasks]
+
     def _calculate_score(
         self, critical_count: int, warning_count: int, info_count: int
     ) -> int:
@@ -225,7 +438,7 @@ class ReviewService:
         critical_count: int,
         warning_count: int,
         info_count: int,
-        findings: List[Dict[str, Any]],
+        category_counts: Counter,
     ) -> str:
         """
         Generate summary text for the review.
@@ -234,7 +447,7 @@ class ReviewService:
             critical_count: Number of critical findings
             warning_count: Number of warning findings
             info_count: Number of info findings
-            findings: List of all findings
+            category_counts: Number of findings per category
 
         Returns:
             str: Summary text
@@ -242,41 +455,55 @@ class ReviewService:
         total = critical_count + warning_count + info_count
 
         if total == 0:
-            return "Great work! No issues found in this pull request."
+            return CLEAN_SUMMARY
 
-        summary_parts = [
-            f"Found {total} issue(s) in this pull request:",
-            f"- {critical_count} critical",
-            f"- {warning_count} warnings",
-            f"- {info_count} info",
-        ]
+        return "\n".join(
+            self._iter_summary_lines(
+                total, critical_count, warning_count, info_count, category_counts
+            )
+        )
+
+    def _iter_summary_lines(
+        self,
+        total: int,
+        critical_count: int,
+        warning_count: int,
+        info_count: int,
+        category_counts: Counter,
+    ) -> Iterator[str]:
+        """
+        Yield the lines of a non-empty review summary.
+
+        Args:
+            total: Total number of findings
+            critical_count: Number of critical findings
+            warning_count: Number of warning findings
+            info_count: Number of info findings
+            category_counts: Number of findings per category
+
+        Yields:
+            str: Summary lines in display order
+        """
+        yield (
+            f"Found {total} issue(s) in this pull request:\n"
+            f"- {critical_count} critical\n"
+            f"- {warning_count} warnings\n"
+            f"- {info_count} info"
+        )
 
         # Add category breakdown
-        categories = {}
-        for finding in findings:
-            category = finding.get("category", "unknown")
-            categories[category] = categories.get(category, 0) + 1
-
-        if categories:
-            summary_parts.append("\nIssues by category:")
-            for category, count in sorted(
-                categories.items(), key=lambda x: x[1], reverse=True
-            ):
-                summary_parts.append(f"- {category}: {count}")
+        if category_counts:
+            yield "\nIssues by category:"
+            for category, count in category_counts.most_common():
+                yield f"- {category}: {count}"
 
         # Add recommendation
         if critical_count > 0:
-            summary_parts.append(
-                "\n⚠️ Critical issues found. Please address before merging."
-            )
+            yield "\n⚠️ Critical issues found. Please address before merging."
         elif warning_count > 5:
-            summary_parts.append(
-                "\n⚡ Several warnings found. Consider addressing them."
-            )
+            yield "\n⚡ Several warnings found. Consider addressing them."
         else:
-            summary_parts.append("\n✓ Code looks good overall. Minor improvements suggested.")
-
-        return "\n".join(summary_parts)
+            yield "\n✓ Code looks good overall. Minor improvements suggested."
 
 
 # Global review service instance
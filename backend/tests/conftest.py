@@ -2,43 +2,98 @@
 Pytest configuration and fixtures for testing.
 """
 
+import os
+from contextlib import asynccontextmanager
+from uuid import UUID
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 from app.database import Base, get_db
 from app.main import app
 from app.models.user import User
+from app.models.repository import Repository
 from app.core.security import create_user_token
 
 
-# Use in-memory SQLite for testing with shared cache
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Use in-memory SQLite for testing with shared cache, so every connection
+# sees the one schema created at session start. The database is named per
+# pytest-xdist worker so parallel runs (pytest -n auto) never share one.
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+SQLALCHEMY_DATABASE_URL = (
+    f"sqlite:///file:test_{XDIST_WORKER}?mode=memory&cache=shared&uri=true"
+)
 
+# Fixed user IDs: every test's user row has the same identity, so each
+# user's JWT is signed once per run and reused (see token_factory)
+TEST_USER_ID = UUID("00000000-0000-0000-0000-000000000001")
+OTHER_USER_ID = UUID("00000000-0000-0000-0000-000000000002")
 
-@pytest.fixture(scope="function")
-def db_engine():
-    """Create a test database engine with poolclass to share connection."""
-    from sqlalchemy.pool import StaticPool
+# Session the shared test client hands to request handlers; set per test
+_current_session = {}
 
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """Create the test database engine and schema once per test run."""
     engine = create_engine(
         SQLALCHEMY_DATABASE_URL,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,  # Share single connection across all access
     )
+
+    # pysqlite's own transaction handling breaks SAVEPOINTs; let SQLAlchemy
+    # emit BEGIN itself so per-test rollbacks work
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    # Durability is pointless for a throwaway test database
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(bind=engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
     engine.dispose()
 
 
-@pytest.fixture(scope="function")
-def db_session(db_engine):
-    """Create a test database session."""
-    TestingSessionLocal = sessionmaker(
-        autocommit=False, autoflush=False, bind=db_engine
+@pytest.fixture(scope="module")
+def module_db_connection(db_engine):
+    """Open a connection whose outer transaction is rolled back after each module."""
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    try:
+        yield connection
+    finally:
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="module")
+def module_db_session(module_db_connection):
+    """
+    Create a session for read-only fixtures shared by a test module.
+
+    Objects keep their loaded state across commits so tests never reload
+    them from inside another test's SAVEPOINT.
+    """
+    session = Session(
+        bind=module_db_connection,
+        autoflush=False,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
     )
-    session = TestingSessionLocal()
     try:
         yield session
     finally:
@@ -46,56 +101,178 @@ def db_session(db_engine):
 
 
 @pytest.fixture(scope="function")
-def client(db_session):
-    """Create test client with database override."""
+def db_connection(request, module_db_connection):
+    """Open a SAVEPOINT on the module connection that is rolled back after each test."""
+    if request.node.get_closest_marker("unit"):
+        pytest.fail("Tests marked 'unit' must not use the database")
+    savepoint = module_db_connection.begin_nested()
+    try:
+        yield module_db_connection
+    finally:
+        if savepoint.is_active:
+            savepoint.rollback()
+
+
+@pytest.fixture(scope="function")
+def db_session(db_connection):
+    """
+    Create a test database session.
+
+    Commits only release a SAVEPOINT inside the per-test SAVEPOINT, so
+    nothing a test writes outlives it.
+    """
+    session = Session(
+        bind=db_connection,
+        autoflush=False,
+        join_transaction_mode="create_savepoint",
+    )
+    _current_session["session"] = session
+    try:
+        yield session
+    finally:
+        _current_session.pop("session", None)
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    """Create one test client for the whole run with a database override."""
 
     def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+        yield _current_session["session"]
+
+    @asynccontextmanager
+    async def no_lifespan(app):
+        yield
 
     app.dependency_overrides[get_db] = override_get_db
-    yield TestClient(app)
-    app.dependency_overrides.clear()
 
+    # Entering the client serves every request from one event-loop thread
+    # instead of starting a portal per request; the app lifespan (review
+    # workers, GitHub client, known-repository preload) is swapped for a
+    # no-op so it is deliberately not run
+    lifespan_context = app.router.lifespan_context
+    app.router.lifespan_context = no_lifespan
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.router.lifespan_context = lifespan_context
+        app.dependency_overrides.clear()
 
-@pytest.fixture
-def test_user(db_session):
-    """Create a test user."""
+
+@pytest.fixture(scope="function")
+def client(app_client, db_session):
+    """Test client whose requests use the current test's session."""
+    return app_client
+
+
+def create_test_user(session):
+    """Add and flush the standard test user in a session."""
     user = User(
+        id=TEST_USER_ID,
         github_id=12345,
         username="testuser",
         email="test@example.com",
         avatar_url="https://avatar.url",
         access_token="github_token",
     )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
+    session.add(user)
+    session.flush()
     return user
 
 
 @pytest.fixture
-def other_user(db_session):
-    """Create another test user."""
+def make_user(db_session):
+    """
+    Factory inserting user rows with a Core INSERT ... RETURNING.
+
+    Skips the ORM unit of work for tests that only need a row to exist.
+    Keyword arguments override the default column values.
+    """
+
+    def _make_user(**values):
+        row = {"github_id": 12345, "username": "testuser", **values}
+        return db_session.scalar(insert(User).values(row).returning(User.id))
+
+    return _make_user
+
+
+@pytest.fixture
+def make_repo(db_session):
+    """Factory inserting a repository row for a user and returning its ID."""
+
+    def _make_repo(user_id, **values):
+        row = {
+            "user_id": user_id,
+            "github_id": 67890,
+            "name": "test-repo",
+            "full_name": "testuser/test-repo",
+            "owner": "testuser",
+            **values,
+        }
+        return db_session.scalar(
+            insert(Repository).values(row).returning(Repository.id)
+        )
+
+    return _make_repo
+
+
+@pytest.fixture
+def test_user(db_session):
+    """Create a test user."""
+    return create_test_user(db_session)
+
+
+@pytest.fixture(scope="module")
+def module_test_user(module_db_session):
+    """Create a test user shared by a module's read-only fixtures."""
+    return create_test_user(module_db_session)
+
+
+@pytest.fixture(scope="module")
+def other_user(module_db_session):
+    """Create another test user, shared by a module (tests only read it)."""
     user = User(
+        id=OTHER_USER_ID,
         github_id=54321,
         username="otheruser",
         email="other@example.com",
     )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
+    module_db_session.add(user)
+    module_db_session.flush()
     return user
 
 
+@pytest.fixture(scope="session")
+def token_factory():
+    """Return a function that issues a JWT for a user, signing each user once."""
+    tokens = {}
+
+    def make(user):
+        if user.id not in tokens:
+            tokens[user.id] = create_user_token(
+                user_id=str(user.id),
+                github_id=user.github_id,
+                username=user.username,
+            )
+        return tokens[user.id]
+
+    return make
+
+
 @pytest.fixture
-def auth_headers(test_user):
-    """Create authentication headers with valid JWT token."""
-    token = create_user_token(
-        user_id=str(test_user.id),
-        github_id=test_user.github_id,
-        username=test_user.username,
-    )
-    return {"Authorization": f"Bearer {token}"}
+def auth_headers(test_user, token_factory):
+    """
+    Create authentication headers with valid JWT token.
+
+    The user row is per test, but its ID is fixed, so the token itself is
+    cached for the whole session.
+    """
+    return {"Authorization": f"Bearer {token_factory(test_user)}"}
+
+
+@pytest.fixture(scope="module")
+def other_auth_headers(other_user, token_factory):
+    """Create authentication headers for the other (non-owner) user."""
+    return {"Authorization": f"Bearer {token_factory(other_user)}"}
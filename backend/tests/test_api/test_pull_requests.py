@@ -3,10 +3,15 @@ Integration tests for pull request API endpoints.
 """
 
 import pytest
+from sqlalchemy import insert
 from app.models.repository import Repository
 from app.models.pull_request import PullRequest
 
 
+# ID that never matches a row, for not-found checks
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+
 @pytest.fixture
 def test_pull_request(db_session, test_user):
     """Create a test repository and pull request."""
@@ -18,8 +23,7 @@ def test_pull_request(db_session, test_user):
         owner="testuser",
     )
     db_session.add(repo)
-    db_session.commit()
-    db_session.refresh(repo)
+    db_session.flush()  # Assigns repo.id without a separate commit
 
     pr = PullRequest(
         repository_id=repo.id,
@@ -36,12 +40,30 @@ def test_pull_request(db_session, test_user):
         github_url="https://github.com/testuser/test-repo/pull/1",
     )
     db_session.add(pr)
-    db_session.commit()
-    db_session.refresh(pr)
+    db_session.flush()
 
     return {"repository": repo, "pull_request": pr}
 
 
+@pytest.fixture
+def many_pull_requests(db_session, test_pull_request):
+    """Create five more open PRs in the test repository in one batch."""
+    pr_ids = db_session.scalars(
+        insert(PullRequest).returning(PullRequest.id),
+        [
+            {
+                "repository_id": test_pull_request["repository"].id,
+                "pr_number": i + 10,
+                "title": f"PR #{i + 10}",
+                "state": "open",
+            }
+            for i in range(5)
+        ],
+    ).all()
+    db_session.flush()
+    return pr_ids
+
+
 class TestPullRequestEndpoints:
     """Tests for pull request API endpoints."""
 
@@ -122,62 +144,42 @@ class TestPullRequestEndpoints:
         assert data["total"] == 1
         assert data["pull_requests"][0]["state"] == "closed"
 
+    @pytest.mark.parametrize(
+        "params,expected_len",
+        [({"limit": 3}, 3), ({"skip": 2, "limit": 2}, 2)],
+    )
     def test_list_pull_requests_pagination(
-        self, client, auth_headers, test_pull_request, db_session
+        self,
+        client,
+        auth_headers,
+        test_pull_request,
+        many_pull_requests,
+        params,
+        expected_len,
     ):
         """Test pull request listing with pagination."""
         repo = test_pull_request["repository"]
 
-        # Create multiple PRs
-        for i in range(5):
-            pr = PullRequest(
-                repository_id=repo.id,
-                pr_number=i + 10,
-                title=f"PR #{i + 10}",
-                state="open",
-            )
-            db_session.add(pr)
-        db_session.commit()
-
-        # Test with limit
-        response = client.get(
-            f"/api/repositories/{repo.id}/pulls",
-            params={"limit": 3},
-            headers=auth_headers,
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert data["total"] == 6  # 1 from fixture + 5 new
-        assert len(data["pull_requests"]) == 3
-
-        # Test with skip
         response = client.get(
             f"/api/repositories/{repo.id}/pulls",
-            params={"skip": 2, "limit": 2},
+            params=params,
             headers=auth_headers,
         )
 
         assert response.status_code == 200
         data = response.json()
-        assert data["total"] == 6
-        assert len(data["pull_requests"]) == 2
+        assert data["total"] == len(many_pull_requests) + 1  # Plus the fixture PR
+        assert len(data["pull_requests"]) == expected_len
 
-    def test_list_pull_requests_unauthorized(self, client, other_user, test_pull_request):
+    def test_list_pull_requests_unauthorized(
+        self, client, other_auth_headers, test_pull_request
+    ):
         """Test listing pull requests for repository owned by another user."""
-        from app.core.security import create_user_token
-
         repo = test_pull_request["repository"]
 
-        # Create token for other user
-        token = create_user_token(
-            user_id=str(other_user.id),
-            github_id=other_user.github_id,
-            username=other_user.username,
+        response = client.get(
+            f"/api/repositories/{repo.id}/pulls", headers=other_auth_headers
         )
-        headers = {"Authorization": f"Bearer {token}"}
-
-        response = client.get(f"/api/repositories/{repo.id}/pulls", headers=headers)
 
         assert response.status_code == 404
 
@@ -196,27 +198,16 @@ class TestPullRequestEndpoints:
 
     def test_get_pull_request_not_found(self, client, auth_headers):
         """Test getting non-existent pull request."""
-        fake_uuid = "00000000-0000-0000-0000-000000000000"
-        response = client.get(f"/api/pulls/{fake_uuid}", headers=auth_headers)
+        response = client.get(f"/api/pulls/{NIL_UUID}", headers=auth_headers)
 
         assert response.status_code == 404
 
     def test_get_pull_request_unauthorized(
-        self, client, other_user, test_pull_request
+        self, client, other_auth_headers, test_pull_request
     ):
         """Test getting pull request owned by another user."""
-        from app.core.security import create_user_token
-
         pr = test_pull_request["pull_request"]
 
-        # Create token for other user
-        token = create_user_token(
-            user_id=str(other_user.id),
-            github_id=other_user.github_id,
-            username=other_user.username,
-        )
-        headers = {"Authorization": f"Bearer {token}"}
-
-        response = client.get(f"/api/pulls/{pr.id}", headers=headers)
+        response = client.get(f"/api/pulls/{pr.id}", headers=other_auth_headers)
 
         assert response.status_code == 404
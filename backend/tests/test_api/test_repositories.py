@@ -2,14 +2,37 @@
 Integration tests for repository API endpoints.
 """
 
+from uuid import UUID
 import pytest
+from sqlalchemy import insert
 from app.models.repository import Repository
-from app.core.security import create_user_token
 
 
-@pytest.fixture
-def test_repository(db_session, test_user):
-    """Create a test repository."""
+# ID that never matches a row, for not-found checks
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+
+# Rows seeded by many_repositories; built once at import
+REPO_ROWS = [
+    {
+        "github_id": 1000 + i,
+        "name": f"repo-{i}",
+        "full_name": f"testuser/repo-{i}",
+        "owner": "testuser",
+    }
+    for i in range(5)
+]
+
+
+@pytest.fixture(scope="module")
+def test_user(module_test_user):
+    """Share one test user across the module's read-only fixtures."""
+    return module_test_user
+
+
+@pytest.fixture(scope="module")
+def test_repository(module_db_session, test_user):
+    """Create a test repository shared by read-only tests in this module."""
     repo = Repository(
         user_id=test_user.id,
         github_id=67890,
@@ -18,18 +41,43 @@ def test_repository(db_session, test_user):
         owner="testuser",
         is_active=True,
     )
+    module_db_session.add(repo)
+    module_db_session.flush()
+    return repo
+
+
+@pytest.fixture
+def writable_repository(db_session, test_user):
+    """Create a repository inside the test's SAVEPOINT for tests that modify it."""
+    repo = Repository(
+        user_id=test_user.id,
+        github_id=67891,
+        name="writable-repo",
+        full_name="testuser/writable-repo",
+        owner="testuser",
+        is_active=True,
+    )
     db_session.add(repo)
-    db_session.commit()
-    db_session.refresh(repo)
+    db_session.flush()
     return repo
 
 
+@pytest.fixture
+def many_repositories(db_session, test_user):
+    """Create five repositories for pagination tests."""
+    repo_ids = db_session.scalars(
+        insert(Repository).returning(Repository.id),
+        [{**row, "user_id": test_user.id} for row in REPO_ROWS],
+    ).all()
+    return repo_ids
+
+
 class TestRepositoryEndpoints:
     """Tests for repository API endpoints."""
 
-    def test_list_repositories_empty(self, client, auth_headers):
+    def test_list_repositories_empty(self, client, other_auth_headers):
         """Test listing repositories when user has none."""
-        response = client.get("/api/repositories", headers=auth_headers)
+        response = client.get("/api/repositories", headers=other_auth_headers)
 
         assert response.status_code == 200
         data = response.json()
@@ -47,44 +95,29 @@ class TestRepositoryEndpoints:
         assert data["repositories"][0]["id"] == str(test_repository.id)
         assert data["repositories"][0]["name"] == "test-repo"
 
+    @pytest.mark.parametrize(
+        "params,expected_len",
+        [({"limit": 3}, 3), ({"skip": 2, "limit": 2}, 2)],
+    )
     def test_list_repositories_pagination(
-        self, client, auth_headers, test_user, db_session
+        self,
+        client,
+        auth_headers,
+        test_repository,
+        many_repositories,
+        params,
+        expected_len,
     ):
         """Test repository listing with pagination."""
-        # Create multiple repositories
-        for i in range(5):
-            repo = Repository(
-                user_id=test_user.id,
-                github_id=1000 + i,
-                name=f"repo-{i}",
-                full_name=f"testuser/repo-{i}",
-                owner="testuser",
-            )
-            db_session.add(repo)
-        db_session.commit()
-
-        # Test with limit
-        response = client.get(
-            "/api/repositories", params={"limit": 3}, headers=auth_headers
-        )
+        response = client.get("/api/repositories", params=params, headers=auth_headers)
 
         assert response.status_code == 200
         data = response.json()
-        assert data["total"] == 5
-        assert len(data["repositories"]) == 3
-
-        # Test with skip
-        response = client.get(
-            "/api/repositories", params={"skip": 2, "limit": 2}, headers=auth_headers
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert data["total"] == 5
-        assert len(data["repositories"]) == 2
+        assert data["total"] == len(many_repositories) + 1  # Plus test_repository
+        assert len(data["repositories"]) == expected_len
 
     def test_list_repositories_filter_active(
-        self, client, auth_headers, test_user, db_session
+        self, client, auth_headers, test_user, test_repository, db_session
     ):
         """Test filtering repositories by active status."""
         # Create active and inactive repositories
@@ -114,8 +147,8 @@ class TestRepositoryEndpoints:
 
         assert response.status_code == 200
         data = response.json()
-        assert data["total"] == 1
-        assert data["repositories"][0]["is_active"] is True
+        assert data["total"] == 2  # active-repo and test_repository
+        assert all(repo["is_active"] for repo in data["repositories"])
 
     def test_list_repositories_unauthorized(self, client):
         """Test listing repositories without authentication."""
@@ -143,8 +176,9 @@ class TestRepositoryEndpoints:
         assert data["name"] == "new-repo"
         assert data["user_id"] == str(test_user.id)
 
-        # Verify in database
-        repo = db_session.query(Repository).filter(Repository.github_id == 99999).first()
+        # Verify in database (the handler shares db_session, so this is an
+        # identity-map lookup)
+        repo = db_session.get(Repository, UUID(data["id"]))
         assert repo is not None
         assert repo.name == "new-repo"
 
@@ -196,36 +230,24 @@ class TestRepositoryEndpoints:
         assert data["name"] == "test-repo"
         assert data["github_id"] == test_repository.github_id
 
-    def test_get_repository_not_found(self, client, auth_headers):
-        """Test getting non-existent repository."""
-        fake_uuid = "00000000-0000-0000-0000-000000000000"
-        response = client.get(f"/api/repositories/{fake_uuid}", headers=auth_headers)
-
-        assert response.status_code == 404
-        assert "not found" in response.json()["detail"]
-
     def test_get_repository_unauthorized_user(
-        self, client, other_user, test_repository
+        self, client, other_auth_headers, test_repository
     ):
         """Test getting repository owned by another user."""
-        # Create token for other user
-        token = create_user_token(
-            user_id=str(other_user.id),
-            github_id=other_user.github_id,
-            username=other_user.username,
+        response = client.get(
+            f"/api/repositories/{test_repository.id}", headers=other_auth_headers
         )
-        headers = {"Authorization": f"Bearer {token}"}
-
-        response = client.get(f"/api/repositories/{test_repository.id}", headers=headers)
 
         assert response.status_code == 404  # Returns 404 to prevent info leak
 
-    def test_update_repository(self, client, auth_headers, test_repository, db_session):
+    def test_update_repository(
+        self, client, auth_headers, writable_repository, db_session
+    ):
         """Test updating a repository."""
         update_data = {"name": "updated-repo", "is_active": False}
 
         response = client.patch(
-            f"/api/repositories/{test_repository.id}",
+            f"/api/repositories/{writable_repository.id}",
             json=update_data,
             headers=auth_headers,
         )
@@ -236,19 +258,19 @@ class TestRepositoryEndpoints:
         assert data["is_active"] is False
 
         # Verify in database
-        db_session.refresh(test_repository)
-        assert test_repository.name == "updated-repo"
-        assert test_repository.is_active is False
+        db_session.refresh(writable_repository)
+        assert writable_repository.name == "updated-repo"
+        assert writable_repository.is_active is False
 
     def test_update_repository_partial(
-        self, client, auth_headers, test_repository, db_session
+        self, client, auth_headers, writable_repository, db_session
     ):
         """Test partial update of repository."""
-        original_name = test_repository.name
+        original_name = writable_repository.name
         update_data = {"is_active": False}
 
         response = client.patch(
-            f"/api/repositories/{test_repository.id}",
+            f"/api/repositories/{writable_repository.id}",
             json=update_data,
             headers=auth_headers,
         )
@@ -258,20 +280,11 @@ class TestRepositoryEndpoints:
         assert data["name"] == original_name  # Unchanged
         assert data["is_active"] is False  # Changed
 
-    def test_update_repository_not_found(self, client, auth_headers):
-        """Test updating non-existent repository."""
-        fake_uuid = "00000000-0000-0000-0000-000000000000"
-        update_data = {"is_active": False}
-
-        response = client.patch(
-            f"/api/repositories/{fake_uuid}", json=update_data, headers=auth_headers
-        )
-
-        assert response.status_code == 404
-
-    def test_delete_repository(self, client, auth_headers, test_repository, db_session):
+    def test_delete_repository(
+        self, client, auth_headers, writable_repository, db_session
+    ):
         """Test deleting a repository."""
-        repo_id = test_repository.id
+        repo_id = writable_repository.id
 
         response = client.delete(
             f"/api/repositories/{repo_id}", headers=auth_headers
@@ -280,16 +293,8 @@ class TestRepositoryEndpoints:
         assert response.status_code == 204
 
         # Verify deleted from database
-        repo = db_session.query(Repository).filter(Repository.id == repo_id).first()
-        assert repo is None
-
-    def test_delete_repository_not_found(self, client, auth_headers):
-        """Test deleting non-existent repository."""
-        fake_uuid = "00000000-0000-0000-0000-000000000000"
-
-        response = client.delete(f"/api/repositories/{fake_uuid}", headers=auth_headers)
-
-        assert response.status_code == 404
+        db_session.expire_all()
+        assert db_session.get(Repository, repo_id) is None
 
     def test_sync_repository(self, client, auth_headers, test_repository):
         """Test manual repository sync endpoint."""
@@ -302,12 +307,23 @@ class TestRepositoryEndpoints:
         assert data["id"] == str(test_repository.id)
         # In Sprint 1, this is just a placeholder that returns the repo
 
-    def test_sync_repository_not_found(self, client, auth_headers):
-        """Test syncing non-existent repository."""
-        fake_uuid = "00000000-0000-0000-0000-000000000000"
-
-        response = client.post(
-            f"/api/repositories/{fake_uuid}/sync", headers=auth_headers
+    @pytest.mark.parametrize(
+        "method,suffix,json",
+        [
+            ("GET", "", None),
+            ("PATCH", "", {"is_active": False}),
+            ("DELETE", "", None),
+            ("POST", "/sync", None),
+        ],
+    )
+    def test_repository_not_found(self, client, auth_headers, method, suffix, json):
+        """Test every repository endpoint returns 404 for an unknown ID."""
+        response = client.request(
+            method,
+            f"/api/repositories/{NIL_UUID}{suffix}",
+            json=json,
+            headers=auth_headers,
         )
 
         assert response.status_code == 404
+        assert "not found" in response.json()["detail"]
@@ -3,15 +3,56 @@ Integration tests for review API endpoints.
 """
 
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import AsyncMock
+from sqlalchemy import insert
 from app.models.repository import Repository
 from app.models.pull_request import PullRequest
 from app.models.review import Review
 from app.models.finding import Finding
+from app.services.review_service import review_service
 
 
-@pytest.fixture
-def test_repository(db_session, test_user):
+# ID that never matches a row, for not-found checks
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+
+# Rows seeded by the pagination fixtures; built once at import
+REVIEW_ROWS = [
+    {
+        "status": "completed",
+        "critical_count": i,
+        "warning_count": i * 2,
+        "info_count": i * 3,
+        "overall_score": 80 - i * 5,
+    }
+    for i in range(5)
+]
+
+FINDING_ROWS = [
+    {
+        "category": "quality",
+        "severity": "info",
+        "title": f"Finding {i}",
+        "description": f"Description {i}",
+    }
+    for i in range(10)
+]
+
+
+@pytest.fixture(autouse=True)
+def no_background_analysis(monkeypatch):
+    """Stub out review analysis so created reviews never start the pipeline."""
+    monkeypatch.setattr(review_service, "_run_analysis", AsyncMock(return_value=None))
+
+
+@pytest.fixture(scope="module")
+def test_user(module_test_user):
+    """Share one test user across the module's read-only fixtures."""
+    return module_test_user
+
+
+@pytest.fixture(scope="module")
+def test_repository(module_db_session, test_user):
     """Create a test repository."""
     repo = Repository(
         user_id=test_user.id,
@@ -20,14 +61,13 @@ def test_repository(db_session, test_user):
         full_name="testuser/test-repo",
         owner="testuser",
     )
-    db_session.add(repo)
-    db_session.commit()
-    db_session.refresh(repo)
+    module_db_session.add(repo)
+    module_db_session.flush()
     return repo
 
 
-@pytest.fixture
-def test_pull_request(db_session, test_repository):
+@pytest.fixture(scope="module")
+def test_pull_request(module_db_session, test_repository):
     """Create a test pull request."""
     pr = PullRequest(
         repository_id=test_repository.id,
@@ -43,14 +83,13 @@ def test_pull_request(db_session, test_repository):
         deletions=50,
         github_url="https://github.com/testuser/test-repo/pull/1",
     )
-    db_session.add(pr)
-    db_session.commit()
-    db_session.refresh(pr)
+    module_db_session.add(pr)
+    module_db_session.flush()
     return pr
 
 
-@pytest.fixture
-def test_review(db_session, test_pull_request):
+@pytest.fixture(scope="module")
+def test_review(module_db_session, test_pull_request):
     """Create a test review."""
     review = Review(
         pull_request_id=test_pull_request.id,
@@ -61,14 +100,13 @@ def test_review(db_session, test_pull_request):
         overall_score=60,
         summary="Test review summary",
     )
-    db_session.add(review)
-    db_session.commit()
-    db_session.refresh(review)
+    module_db_session.add(review)
+    module_db_session.flush()
     return review
 
 
-@pytest.fixture
-def test_findings(db_session, test_review):
+@pytest.fixture(scope="module")
+def test_findings(module_db_session, test_review):
     """Create test findings."""
     findings = []
 
@@ -117,27 +155,70 @@ def test_findings(db_session, test_review):
     findings.append(finding3)
 
     for finding in findings:
-        db_session.add(finding)
+        module_db_session.add(finding)
 
-    db_session.commit()
-
-    for finding in findings:
-        db_session.refresh(finding)
+    module_db_session.flush()
 
     return findings
 
 
+@pytest.fixture
+def many_reviews(db_session, test_pull_request):
+    """Create five completed reviews for pagination tests."""
+    review_ids = db_session.scalars(
+        insert(Review).returning(Review.id),
+        [{**row, "pull_request_id": test_pull_request.id} for row in REVIEW_ROWS],
+    ).all()
+    return review_ids
+
+
+@pytest.fixture
+def many_findings(db_session, test_review):
+    """Create ten info findings on the test review for pagination tests."""
+    finding_ids = db_session.scalars(
+        insert(Finding).returning(Finding.id),
+        [{**row, "review_id": test_review.id} for row in FINDING_ROWS],
+    ).all()
+    return finding_ids
+
+
+@pytest.fixture
+def populated_stats(db_session, test_pull_request, test_review):
+    """Add pending, failed and completed reviews alongside test_review."""
+    db_session.execute(
+        insert(Review),
+        [
+            {
+                "pull_request_id": test_pull_request.id,
+                "status": "pending",
+                "critical_count": 0,
+                "warning_count": 0,
+                "info_count": 0,
+            },
+            {
+                "pull_request_id": test_pull_request.id,
+                "status": "failed",
+                "critical_count": 0,
+                "warning_count": 0,
+                "info_count": 0,
+            },
+            {
+                "pull_request_id": test_pull_request.id,
+                "status": "completed",
+                "critical_count": 1,
+                "warning_count": 3,
+                "info_count": 5,
+                "overall_score": 80,
+            },
+        ],
+    )
+
+
 class TestReviewEndpoints:
     """Tests for review API endpoints."""
 
-    @patch("app.services.review_service.review_service._run_analysis")
-    def test_create_review(
-        self, mock_analysis, client, auth_headers, test_pull_request
-    ):
+    def test_create_review(self, client, auth_headers, test_pull_request):
         """Test creating a new code review."""
-        # Mock the async analysis so it doesn't actually run
-        mock_analysis.return_value = None
-
         response = client.post(
             f"/api/pulls/{test_pull_request.id}/reviews",
             headers=auth_headers,
@@ -153,9 +234,8 @@ class TestReviewEndpoints:
 
     def test_create_review_pr_not_found(self, client, auth_headers):
         """Test creating review for non-existent PR."""
-        fake_uuid = "00000000-0000-0000-0000-000000000000"
         response = client.post(
-            f"/api/pulls/{fake_uuid}/reviews",
+            f"/api/pulls/{NIL_UUID}/reviews",
             headers=auth_headers,
         )
 
@@ -163,29 +243,19 @@ class TestReviewEndpoints:
         assert "not found" in response.json()["detail"].lower()
 
     def test_create_review_unauthorized(
-        self, client, other_user, test_pull_request
+        self, client, other_auth_headers, test_pull_request
     ):
         """Test creating review for PR owned by another user."""
-        from app.core.security import create_user_token
-
-        # Create token for other user
-        token = create_user_token(
-            user_id=str(other_user.id),
-            github_id=other_user.github_id,
-            username=other_user.username,
-        )
-        headers = {"Authorization": f"Bearer {token}"}
-
         response = client.post(
             f"/api/pulls/{test_pull_request.id}/reviews",
-            headers=headers,
+            headers=other_auth_headers,
         )
 
         assert response.status_code == 404
 
-    def test_list_reviews_empty(self, client, auth_headers, test_user):
+    def test_list_reviews_empty(self, client, other_auth_headers):
         """Test listing reviews when there are none."""
-        response = client.get("/api/reviews", headers=auth_headers)
+        response = client.get("/api/reviews", headers=other_auth_headers)
 
         assert response.status_code == 200
         data = response.json()
@@ -243,46 +313,20 @@ class TestReviewEndpoints:
         assert data["total"] == 1
         assert data["reviews"][0]["status"] == "pending"
 
+    @pytest.mark.parametrize(
+        "params,expected_len",
+        [({"limit": 3}, 3), ({"skip": 2, "limit": 2}, 2)],
+    )
     def test_list_reviews_pagination(
-        self, client, auth_headers, test_review, db_session, test_pull_request
+        self, client, auth_headers, test_review, many_reviews, params, expected_len
     ):
         """Test review listing with pagination."""
-        # Create additional reviews
-        for i in range(5):
-            review = Review(
-                pull_request_id=test_pull_request.id,
-                status="completed",
-                critical_count=i,
-                warning_count=i * 2,
-                info_count=i * 3,
-                overall_score=80 - i * 5,
-            )
-            db_session.add(review)
-        db_session.commit()
-
-        # Test with limit
-        response = client.get(
-            "/api/reviews",
-            params={"limit": 3},
-            headers=auth_headers,
-        )
+        response = client.get("/api/reviews", params=params, headers=auth_headers)
 
         assert response.status_code == 200
         data = response.json()
-        assert data["total"] == 6  # 1 from fixture + 5 new
-        assert len(data["reviews"]) == 3
-
-        # Test with skip
-        response = client.get(
-            "/api/reviews",
-            params={"skip": 2, "limit": 2},
-            headers=auth_headers,
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert data["total"] == 6
-        assert len(data["reviews"]) == 2
+        assert data["total"] == len(many_reviews) + 1  # Plus the fixture review
+        assert len(data["reviews"]) == expected_len
 
     def test_get_review(self, client, auth_headers, test_review):
         """Test getting a specific review."""
@@ -300,31 +344,23 @@ class TestReviewEndpoints:
         assert data["info_count"] == 10
         assert data["overall_score"] == 60
 
-    def test_get_review_not_found(self, client, auth_headers):
-        """Test getting non-existent review."""
-        fake_uuid = "00000000-0000-0000-0000-000000000000"
+    @pytest.mark.parametrize("suffix", ["", "/findings"])
+    def test_review_not_found(self, client, auth_headers, suffix):
+        """Test review endpoints return 404 for an unknown review ID."""
         response = client.get(
-            f"/api/reviews/{fake_uuid}",
+            f"/api/reviews/{NIL_UUID}{suffix}",
             headers=auth_headers,
         )
 
         assert response.status_code == 404
 
-    def test_get_review_unauthorized(self, client, other_user, test_review):
+    def test_get_review_unauthorized(
+        self, client, other_auth_headers, test_review
+    ):
         """Test getting review owned by another user."""
-        from app.core.security import create_user_token
-
-        # Create token for other user
-        token = create_user_token(
-            user_id=str(other_user.id),
-            github_id=other_user.github_id,
-            username=other_user.username,
-        )
-        headers = {"Authorization": f"Bearer {token}"}
-
         response = client.get(
             f"/api/reviews/{test_review.id}",
-            headers=headers,
+            headers=other_auth_headers,
         )
 
         assert response.status_code == 404
@@ -380,47 +416,36 @@ class TestReviewEndpoints:
         assert data["findings"][0]["category"] == "quality"
         assert data["findings"][0]["severity"] == "warning"
 
+    @pytest.mark.parametrize(
+        "params,expected_len",
+        [({"limit": 5}, 5), ({"skip": 10, "limit": 5}, 3)],
+    )
     def test_list_findings_pagination(
-        self, client, auth_headers, test_review, test_findings, db_session
+        self,
+        client,
+        auth_headers,
+        test_review,
+        test_findings,
+        many_findings,
+        params,
+        expected_len,
     ):
         """Test finding listing with pagination."""
-        # Create additional findings
-        for i in range(10):
-            finding = Finding(
-                review_id=test_review.id,
-                category="quality",
-                severity="info",
-                title=f"Finding {i}",
-                description=f"Description {i}",
-            )
-            db_session.add(finding)
-        db_session.commit()
-
-        # Test with limit
         response = client.get(
             f"/api/reviews/{test_review.id}/findings",
-            params={"limit": 5},
+            params=params,
             headers=auth_headers,
         )
 
         assert response.status_code == 200
         data = response.json()
-        assert data["total"] == 13  # 3 from fixture + 10 new
-        assert len(data["findings"]) == 5
-
-    def test_list_findings_review_not_found(self, client, auth_headers):
-        """Test listing findings for non-existent review."""
-        fake_uuid = "00000000-0000-0000-0000-000000000000"
-        response = client.get(
-            f"/api/reviews/{fake_uuid}/findings",
-            headers=auth_headers,
-        )
+        # Plus the three fixture findings
+        assert data["total"] == len(many_findings) + len(test_findings)
+        assert len(data["findings"]) == expected_len
 
-        assert response.status_code == 404
-
-    def test_get_review_stats_empty(self, client, auth_headers, test_user):
+    def test_get_review_stats_empty(self, client, other_auth_headers):
         """Test getting review statistics when there are no reviews."""
-        response = client.get("/api/stats", headers=auth_headers)
+        response = client.get("/api/stats", headers=other_auth_headers)
 
         assert response.status_code == 200
         data = response.json()
@@ -433,41 +458,8 @@ class TestReviewEndpoints:
         assert data["total_warning_findings"] == 0
         assert data["total_info_findings"] == 0
 
-    def test_get_review_stats(
-        self, client, auth_headers, test_review, db_session, test_pull_request
-    ):
+    def test_get_review_stats(self, client, auth_headers, populated_stats):
         """Test getting review statistics."""
-        # Create additional reviews with different statuses
-        pending_review = Review(
-            pull_request_id=test_pull_request.id,
-            status="pending",
-            critical_count=0,
-            warning_count=0,
-            info_count=0,
-        )
-        db_session.add(pending_review)
-
-        failed_review = Review(
-            pull_request_id=test_pull_request.id,
-            status="failed",
-            critical_count=0,
-            warning_count=0,
-            info_count=0,
-        )
-        db_session.add(failed_review)
-
-        completed_review2 = Review(
-            pull_request_id=test_pull_request.id,
-            status="completed",
-            critical_count=1,
-            warning_count=3,
-            info_count=5,
-            overall_score=80,
-        )
-        db_session.add(completed_review2)
-
-        db_session.commit()
-
         response = client.get("/api/stats", headers=auth_headers)
 
         assert response.status_code == 200
@@ -3,7 +3,11 @@ Unit tests for database models.
 """
 
 import pytest
-from datetime import datetime, date
+from contextlib import contextmanager
+from datetime import datetime, date, timedelta
+from types import SimpleNamespace
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
 from app.models.user import User
 from app.models.repository import Repository
 from app.models.pull_request import PullRequest
@@ -12,6 +16,44 @@ from app.models.finding import Finding
 from app.models.review_metrics import ReviewMetrics
 
 
+# Fixed review timestamps, so stored values can be compared exactly
+STARTED_AT = datetime(2024, 1, 1, 0, 0, 0)
+COMPLETED_AT = datetime(2024, 1, 1, 0, 1, 0)
+
+
+@contextmanager
+def count_queries(conn):
+    """Collect the SQL statements a connection executes inside the block."""
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        queries.append(statement)
+
+    event.listen(conn, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(conn, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def review_ctx(db_session):
+    """Create a user, repository, pull request and review in one flush."""
+    user = User(github_id=12345, username="testuser")
+    repo = Repository(
+        user=user,
+        github_id=67890,
+        name="test-repo",
+        full_name="testuser/test-repo",
+        owner="testuser",
+    )
+    pr = PullRequest(repository=repo, pr_number=1, title="Test PR")
+    review = Review(pull_request=pr, status="completed", overall_score=85)
+    db_session.add_all([user, repo, pr, review])
+    db_session.flush()
+    return SimpleNamespace(user=user, repo=repo, pr=pr, review=review)
+
+
 class TestUserModel:
     """Tests for User model."""
 
@@ -50,30 +92,27 @@ class TestUserModel:
         assert user_dict["username"] == "testuser"
         assert "access_token" not in user_dict  # Should not include sensitive data
 
-    def test_user_unique_github_id(self, db_session):
+    def test_user_unique_github_id(self, db_session, make_user):
         """Test that github_id is unique."""
-        user1 = User(github_id=12345, username="user1")
-        db_session.add(user1)
-        db_session.commit()
+        make_user(github_id=12345, username="user1")
 
         user2 = User(github_id=12345, username="user2")
         db_session.add(user2)
 
-        with pytest.raises(Exception):  # Should raise IntegrityError
+        with pytest.raises(IntegrityError):
             db_session.commit()
+        db_session.rollback()
 
 
 class TestRepositoryModel:
     """Tests for Repository model."""
 
-    def test_create_repository(self, db_session):
+    def test_create_repository(self, db_session, make_user):
         """Test creating a repository."""
-        user = User(github_id=12345, username="testuser")
-        db_session.add(user)
-        db_session.commit()
+        user_id = make_user()
 
         repo = Repository(
-            user_id=user.id,
+            user_id=user_id,
             github_id=67890,
             name="test-repo",
             full_name="testuser/test-repo",
@@ -84,83 +123,58 @@ class TestRepositoryModel:
         db_session.commit()
 
         assert repo.id is not None
-        assert repo.user_id == user.id
+        assert repo.user_id == user_id
         assert repo.github_id == 67890
         assert repo.is_active is True
 
-    def test_repository_user_relationship(self, db_session):
+    def test_repository_user_relationship(self, db_session, make_user, make_repo):
         """Test repository-user relationship."""
-        user = User(github_id=12345, username="testuser")
-        db_session.add(user)
-        db_session.commit()
+        user_id = make_user()
+        user = db_session.get(User, user_id)
+        repo = db_session.get(Repository, make_repo(user_id))
 
-        repo = Repository(
-            user_id=user.id,
-            github_id=67890,
-            name="test-repo",
-            full_name="testuser/test-repo",
-            owner="testuser",
-        )
-        db_session.add(repo)
-        db_session.commit()
+        # Test forward relationship (resolved from the identity map)
+        with count_queries(db_session.connection()) as queries:
+            assert repo.user == user
+        assert len(queries) == 0
 
-        # Test forward relationship
-        assert repo.user == user
+        # Test backward relationship: one SELECT, then served from the instance
+        with count_queries(db_session.connection()) as queries:
+            assert user.repositories == [repo]
+        assert len(queries) == 1
 
-        # Test backward relationship
-        user_repos = user.repositories.all()
-        assert len(user_repos) == 1
-        assert user_repos[0] == repo
+        with count_queries(db_session.connection()) as queries:
+            assert len(user.repositories) == 1
+        assert len(queries) == 0
 
-    def test_repository_cascade_delete(self, db_session):
+    def test_repository_cascade_delete(self, db_session, make_user, make_repo):
         """Test that deleting a user cascades to repositories."""
-        user = User(github_id=12345, username="testuser")
-        db_session.add(user)
-        db_session.commit()
-
-        repo = Repository(
-            user_id=user.id,
-            github_id=67890,
-            name="test-repo",
-            full_name="testuser/test-repo",
-            owner="testuser",
-        )
-        db_session.add(repo)
-        db_session.commit()
-
-        repo_id = repo.id
+        user_id = make_user()
+        repo_id = make_repo(user_id)
 
         # Delete user
-        db_session.delete(user)
+        db_session.delete(db_session.get(User, user_id))
         db_session.commit()
 
         # Repository should be deleted
-        deleted_repo = db_session.query(Repository).filter(Repository.id == repo_id).first()
-        assert deleted_repo is None
+        db_session.expire_all()
+        assert db_session.get(Repository, repo_id) is None
+
+    def test_repository_owner_and_repo(self):
+        """Test owner and name are split from full_name."""
+        repo = Repository(full_name="testuser/test-repo")
+
+        assert repo.owner_and_repo == ("testuser", "test-repo")
 
 
 class TestPullRequestModel:
     """Tests for PullRequest model."""
 
-    def test_create_pull_request(self, db_session):
+    def test_create_pull_request(self, db_session, review_ctx):
         """Test creating a pull request."""
-        user = User(github_id=12345, username="testuser")
-        db_session.add(user)
-        db_session.commit()
-
-        repo = Repository(
-            user_id=user.id,
-            github_id=67890,
-            name="test-repo",
-            full_name="testuser/test-repo",
-            owner="testuser",
-        )
-        db_session.add(repo)
-        db_session.commit()
-
         pr = PullRequest(
-            repository_id=repo.id,
-            pr_number=1,
+            repository_id=review_ctx.repo.id,
+            pr_number=2,
             title="Test PR",
             description="Test description",
             author="testuser",
@@ -175,82 +189,39 @@ class TestPullRequestModel:
         db_session.commit()
 
         assert pr.id is not None
-        assert pr.pr_number == 1
+        assert pr.pr_number == 2
         assert pr.title == "Test PR"
         assert pr.state == "open"
 
-    def test_pull_request_unique_constraint(self, db_session):
+    def test_pull_request_unique_constraint(self, db_session, review_ctx):
         """Test unique constraint on (repository_id, pr_number)."""
-        user = User(github_id=12345, username="testuser")
-        db_session.add(user)
-        db_session.commit()
-
-        repo = Repository(
-            user_id=user.id,
-            github_id=67890,
-            name="test-repo",
-            full_name="testuser/test-repo",
-            owner="testuser",
-        )
-        db_session.add(repo)
-        db_session.commit()
-
-        pr1 = PullRequest(
-            repository_id=repo.id,
-            pr_number=1,
-            title="Test PR 1",
-        )
-        db_session.add(pr1)
-        db_session.commit()
-
-        pr2 = PullRequest(
-            repository_id=repo.id,
-            pr_number=1,  # Same pr_number in same repo
+        pr = PullRequest(
+            repository_id=review_ctx.repo.id,
+            pr_number=review_ctx.pr.pr_number,  # Same pr_number in same repo
             title="Test PR 2",
         )
-        db_session.add(pr2)
+        db_session.add(pr)
 
-        with pytest.raises(Exception):  # Should raise IntegrityError
+        with pytest.raises(IntegrityError):
             db_session.commit()
+        db_session.rollback()
 
 
 class TestReviewModel:
     """Tests for Review model."""
 
-    def test_create_review(self, db_session):
+    def test_create_review(self, db_session, review_ctx):
         """Test creating a review."""
-        user = User(github_id=12345, username="testuser")
-        db_session.add(user)
-        db_session.commit()
-
-        repo = Repository(
-            user_id=user.id,
-            github_id=67890,
-            name="test-repo",
-            full_name="testuser/test-repo",
-            owner="testuser",
-        )
-        db_session.add(repo)
-        db_session.commit()
-
-        pr = PullRequest(
-            repository_id=repo.id,
-            pr_number=1,
-            title="Test PR",
-        )
-        db_session.add(pr)
-        db_session.commit()
-
         review = Review(
-            pull_request_id=pr.id,
+            pull_request_id=review_ctx.pr.id,
             status="completed",
             overall_score=85,
             summary="Good code quality",
             critical_count=0,
             warning_count=2,
             info_count=5,
-            started_at=datetime.utcnow(),
-            completed_at=datetime.utcnow(),
+            started_at=STARTED_AT,
+            completed_at=COMPLETED_AT,
         )
         db_session.add(review)
         db_session.commit()
@@ -261,85 +232,32 @@ class TestReviewModel:
         assert review.critical_count == 0
         assert review.warning_count == 2
         assert review.info_count == 5
+        assert review.started_at == STARTED_AT
+        assert review.completed_at - review.started_at == timedelta(minutes=1)
 
-    def test_review_pull_request_relationship(self, db_session):
+    def test_review_pull_request_relationship(self, db_session, review_ctx):
         """Test review-pull request relationship."""
-        user = User(github_id=12345, username="testuser")
-        db_session.add(user)
-        db_session.commit()
+        review, pr = review_ctx.review, review_ctx.pr
 
-        repo = Repository(
-            user_id=user.id,
-            github_id=67890,
-            name="test-repo",
-            full_name="testuser/test-repo",
-            owner="testuser",
-        )
-        db_session.add(repo)
-        db_session.commit()
-
-        pr = PullRequest(
-            repository_id=repo.id,
-            pr_number=1,
-            title="Test PR",
-        )
-        db_session.add(pr)
-        db_session.commit()
+        # Test forward relationship (resolved from the identity map)
+        with count_queries(db_session.connection()) as queries:
+            assert review.pull_request == pr
+        assert len(queries) == 0
 
-        review = Review(
-            pull_request_id=pr.id,
-            status="completed",
-            overall_score=85,
-        )
-        db_session.add(review)
-        db_session.commit()
-
-        # Test forward relationship
-        assert review.pull_request == pr
-
-        # Test backward relationship
-        pr_reviews = pr.reviews.all()
-        assert len(pr_reviews) == 1
-        assert pr_reviews[0] == review
+        # Test backward relationship: populated through the back-reference
+        # when the review was attached, so no SELECT is needed
+        with count_queries(db_session.connection()) as queries:
+            assert pr.reviews == [review]
+        assert len(queries) == 0
 
 
 class TestFindingModel:
     """Tests for Finding model."""
 
-    def test_create_finding(self, db_session):
+    def test_create_finding(self, db_session, review_ctx):
         """Test creating a finding."""
-        user = User(github_id=12345, username="testuser")
-        db_session.add(user)
-        db_session.commit()
-
-        repo = Repository(
-            user_id=user.id,
-            github_id=67890,
-            name="test-repo",
-            full_name="testuser/test-repo",
-            owner="testuser",
-        )
-        db_session.add(repo)
-        db_session.commit()
-
-        pr = PullRequest(
-            repository_id=repo.id,
-            pr_number=1,
-            title="Test PR",
-        )
-        db_session.add(pr)
-        db_session.commit()
-
-        review = Review(
-            pull_request_id=pr.id,
-            status="completed",
-            overall_score=85,
-        )
-        db_session.add(review)
-        db_session.commit()
-
         finding = Finding(
-            review_id=review.id,
+            review_id=review_ctx.review.id,
             category="security",
             severity="critical",
             title="SQL Injection vulnerability",
@@ -358,32 +276,10 @@ class TestFindingModel:
         assert finding.severity == "critical"
         assert finding.tool_source == "bandit"
 
-    def test_finding_to_dict(self, db_session):
+    def test_finding_to_dict(self, db_session, review_ctx):
         """Test finding to_dict method."""
-        user = User(github_id=12345, username="testuser")
-        db_session.add(user)
-        db_session.commit()
-
-        repo = Repository(
-            user_id=user.id,
-            github_id=67890,
-            name="test-repo",
-            full_name="testuser/test-repo",
-            owner="testuser",
-        )
-        db_session.add(repo)
-        db_session.commit()
-
-        pr = PullRequest(repository_id=repo.id, pr_number=1, title="Test PR")
-        db_session.add(pr)
-        db_session.commit()
-
-        review = Review(pull_request_id=pr.id, status="completed")
-        db_session.add(review)
-        db_session.commit()
-
         finding = Finding(
-            review_id=review.id,
+            review_id=review_ctx.review.id,
             category="security",
             severity="critical",
             title="Test finding",
@@ -400,24 +296,10 @@ class TestFindingModel:
 class TestReviewMetricsModel:
     """Tests for ReviewMetrics model."""
 
-    def test_create_review_metrics(self, db_session):
+    def test_create_review_metrics(self, db_session, review_ctx):
         """Test creating review metrics."""
-        user = User(github_id=12345, username="testuser")
-        db_session.add(user)
-        db_session.commit()
-
-        repo = Repository(
-            user_id=user.id,
-            github_id=67890,
-            name="test-repo",
-            full_name="testuser/test-repo",
-            owner="testuser",
-        )
-        db_session.add(repo)
-        db_session.commit()
-
         metrics = ReviewMetrics(
-            repository_id=repo.id,
+            repository_id=review_ctx.repo.id,
             date=date.today(),
             total_reviews=10,
             avg_score=85.5,
@@ -433,26 +315,12 @@ class TestReviewMetricsModel:
         assert float(metrics.avg_score) == 85.5
         assert metrics.critical_findings == 2
 
-    def test_review_metrics_unique_constraint(self, db_session):
+    def test_review_metrics_unique_constraint(self, db_session, review_ctx):
         """Test unique constraint on (repository_id, date)."""
-        user = User(github_id=12345, username="testuser")
-        db_session.add(user)
-        db_session.commit()
-
-        repo = Repository(
-            user_id=user.id,
-            github_id=67890,
-            name="test-repo",
-            full_name="testuser/test-repo",
-            owner="testuser",
-        )
-        db_session.add(repo)
-        db_session.commit()
-
         today = date.today()
 
         metrics1 = ReviewMetrics(
-            repository_id=repo.id,
+            repository_id=review_ctx.repo.id,
             date=today,
             total_reviews=10,
         )
@@ -460,11 +328,12 @@ class TestReviewMetricsModel:
         db_session.commit()
 
         metrics2 = ReviewMetrics(
-            repository_id=repo.id,
+            repository_id=review_ctx.repo.id,
             date=today,  # Same date for same repo
             total_reviews=20,
         )
         db_session.add(metrics2)
 
-        with pytest.raises(Exception):  # Should raise IntegrityError
+        with pytest.raises(IntegrityError):
             db_session.commit()
+        db_session.rollback()
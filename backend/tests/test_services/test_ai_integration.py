@@ -2,79 +2,136 @@
 Tests for AI integration (Claude service and AI reviewer).
 """
 
+import asyncio
+import time
 import pytest
-from unittest.mock import Mock, patch, AsyncMock, MagicMock
-from app.services.claude_service import ClaudeService
+from functools import lru_cache
+from unittest.mock import Mock, AsyncMock, MagicMock
+from app.services.claude_service import ClaudeService, REVIEW_INSTRUCTIONS
 from app.services.analysis.ai_reviewer import AIReviewer
 from pathlib import Path
 
 
+# None of these tests touch the database
+pytestmark = pytest.mark.unit
+
+
+AI_RESPONSES_DIR = Path(__file__).parent.parent / "fixtures" / "ai_responses"
+
+
+@lru_cache(maxsize=None)
+def load_ai_response(name: str) -> str:
+    """Read a canned Claude response from the fixtures directory."""
+    return (AI_RESPONSES_DIR / name).read_text()
+
+
+TEXT_RESPONSE = "This is just text feedback about the code"
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """Run every async test in this module on one event loop."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def sample_files():
+    """A single small Python file to hand to the AI reviewer."""
+    return {"test.py": "print('hello')"}
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """A fresh workspace directory for each analyzer run."""
+    return tmp_path
+
+
+@pytest.fixture(scope="module")
+def reviewer():
+    """Create one AI reviewer shared by the tests in this module."""
+    return AIReviewer()
+
+
+@pytest.fixture
+def mock_service(monkeypatch):
+    """Replace the Claude service the AI reviewer calls with a mock."""
+    service = MagicMock()
+    monkeypatch.setattr("app.services.analysis.ai_reviewer.claude_service", service)
+    return service
+
+
+@pytest.fixture(scope="module")
+def claude_service():
+    """Create one Claude service shared by the tests in this module."""
+    return ClaudeService()
+
+
 class TestClaudeService:
     """Tests for Claude API service."""
 
-    def test_service_initialization(self):
+    def test_service_initialization(self, claude_service):
         """Test Claude service initializes correctly."""
-        service = ClaudeService()
-        assert service.model == "claude-3-5-sonnet-20241022"
-        assert service.max_tokens == 4096
-        assert service.temperature == 0.0
+        assert claude_service.model == "claude-3-5-sonnet-20241022"
+        assert claude_service.max_tokens == 4096
+        assert claude_service.temperature == 0.0
 
-    @patch("app.services.claude_service.settings.ANTHROPIC_API_KEY", "")
-    def test_is_available_without_api_key(self):
+    def test_is_available_without_api_key(self, monkeypatch):
         """Test service reports unavailable when API key is missing."""
+        monkeypatch.setattr(
+            "app.services.claude_service.settings.ANTHROPIC_API_KEY", ""
+        )
         service = ClaudeService()
         assert service.is_available() is False
 
-    @patch("app.services.claude_service.settings.ANTHROPIC_API_KEY", "test-key")
-    def test_is_available_with_api_key(self):
+    def test_is_available_with_api_key(self, monkeypatch):
         """Test service reports available when API key is present."""
+        monkeypatch.setattr(
+            "app.services.claude_service.settings.ANTHROPIC_API_KEY", "test-key"
+        )
         service = ClaudeService()
         assert service.is_available() is True
 
-    @pytest.mark.asyncio
-    @patch("app.services.claude_service.settings.ANTHROPIC_API_KEY", "")
-    async def test_review_code_without_api_key(self):
+    async def test_review_code_without_api_key(self, claude_service, monkeypatch):
         """Test review code raises error without API key."""
-        service = ClaudeService()
+        monkeypatch.setattr(claude_service, "client", None)
         files = {"test.py": "print('hello')"}
 
         with pytest.raises(Exception, match="Claude API key not configured"):
-            await service.review_code(files)
+            await claude_service.review_code(files)
 
-    def test_build_review_prompt(self):
+    def test_build_review_prompt(self, claude_service):
         """Test review prompt construction."""
-        service = ClaudeService()
         files = {"app/main.py": "def hello():\n    print('world')"}
         pr_context = {"title": "Test PR", "description": "Test description"}
 
-        prompt = service._build_review_prompt(files, pr_context)
+        prompt = claude_service._build_review_prompt(files, pr_context)
 
         assert "Test PR" in prompt
         assert "Test description" in prompt
         assert "app/main.py" in prompt
         assert "def hello():" in prompt
-        assert "best-practices" in prompt
-        assert "JSON format" in prompt
+        # Static instructions are sent separately as a cached block
+        assert "JSON format" not in prompt
+        assert "best-practices" in REVIEW_INSTRUCTIONS
+        assert "JSON format" in REVIEW_INSTRUCTIONS
 
-    def test_build_review_prompt_without_context(self):
+    def test_build_review_prompt_without_context(self, claude_service):
         """Test review prompt without PR context."""
-        service = ClaudeService()
         files = {"test.py": "x = 1"}
 
-        prompt = service._build_review_prompt(files, None)
+        prompt = claude_service._build_review_prompt(files, None)
 
         assert "test.py" in prompt
         assert "x = 1" in prompt
         assert "Pull Request Context" not in prompt
 
-    @pytest.mark.asyncio
-    @patch("app.services.claude_service.settings.ANTHROPIC_API_KEY", "test-key")
-    @patch("app.services.claude_service.anthropic.Anthropic")
-    async def test_review_code_success(self, mock_anthropic_class):
+    async def test_review_code_success(self, claude_service, monkeypatch):
         """Test successful code review call."""
-        # Mock the Anthropic client
+        # Stand in for the Anthropic client
         mock_client = Mock()
-        mock_anthropic_class.return_value = mock_client
+        monkeypatch.setattr(claude_service, "client", mock_client)
 
         # Mock the response
         mock_response = Mock()
@@ -85,132 +142,100 @@ class TestClaudeService:
 
         mock_client.messages.create.return_value = mock_response
 
-        service = ClaudeService()
         files = {"test.py": "print('hello')"}
 
-        result = await service.review_code(files)
+        result = await claude_service.review_code(files)
 
         assert "Code looks good" in result
         mock_client.messages.create.assert_called_once()
 
-    @pytest.mark.asyncio
-    @patch("app.services.claude_service.settings.ANTHROPIC_API_KEY", "test-key")
-    @patch("app.services.claude_service.anthropic.Anthropic")
-    async def test_review_code_api_error(self, mock_anthropic_class):
+        # Static instructions go first, marked for prompt caching
+        content = mock_client.messages.create.call_args[1]["messages"][0]["content"]
+        assert content[0]["text"] == REVIEW_INSTRUCTIONS
+        assert content[0]["cache_control"] == {"type": "ephemeral"}
+        assert "print('hello')" in content[1]["text"]
+
+    async def test_review_code_api_error(self, claude_service, monkeypatch):
         """Test code review handles API errors."""
         mock_client = Mock()
-        mock_anthropic_class.return_value = mock_client
+        monkeypatch.setattr(claude_service, "client", mock_client)
 
         # Simulate API error
         mock_client.messages.create.side_effect = Exception("API error")
 
-        service = ClaudeService()
         files = {"test.py": "print('hello')"}
 
         with pytest.raises(Exception, match="Claude API call failed"):
-            await service.review_code(files)
+            await claude_service.review_code(files)
 
 
 class TestAIReviewer:
     """Tests for AI reviewer analyzer."""
 
-    def test_ai_reviewer_initialization(self):
+    def test_ai_reviewer_initialization(self, reviewer):
         """Test AI reviewer initializes correctly."""
-        reviewer = AIReviewer()
         assert reviewer.name == "AI Reviewer"
 
-    @pytest.mark.asyncio
-    @patch("app.services.analysis.ai_reviewer.claude_service")
-    async def test_analyze_without_api_key(self, mock_service):
+    async def test_analyze_without_api_key(
+        self, mock_service, reviewer, sample_files, workspace
+    ):
         """Test analyze returns error when API key not configured."""
         mock_service.is_available.return_value = False
 
-        reviewer = AIReviewer()
-        files = {"test.py": "print('hello')"}
-        workspace = Path("/tmp/test")
-
-        result = await reviewer.analyze(files, workspace)
+        result = await reviewer.analyze(sample_files, workspace)
 
         assert result.success is False
         assert "Claude API key not configured" in result.error
         assert len(result.findings) == 0
 
-    @pytest.mark.asyncio
-    @patch("app.services.analysis.ai_reviewer.claude_service")
-    async def test_analyze_success(self, mock_service):
+    async def test_analyze_success(
+        self, mock_service, reviewer, sample_files, workspace
+    ):
         """Test successful AI analysis."""
         mock_service.is_available.return_value = True
-        mock_service.review_code = AsyncMock(return_value='''
-```json
-{
-  "findings": [
-    {
-      "category": "best-practices",
-      "severity": "warning",
-      "title": "Use type hints",
-      "description": "Function lacks type hints",
-      "file_path": "test.py",
-      "line_number": 1,
-      "code_snippet": "def hello():",
-      "suggestion": "Add type hints: def hello() -> None:"
-    }
-  ],
-  "summary": "Good code overall, minor improvements needed"
-}
-```
-        ''')
-
-        reviewer = AIReviewer()
-        files = {"test.py": "def hello():\n    print('world')"}
-        workspace = Path("/tmp/test")
-
-        result = await reviewer.analyze(files, workspace)
+        mock_service.review_code = AsyncMock(
+            return_value=load_ai_response("type_hints.md")
+        )
+
+        result = await reviewer.analyze(sample_files, workspace)
 
         assert result.success is True
         assert len(result.findings) == 1
-        assert result.findings[0]["title"] == "Use type hints"
-        assert result.findings[0]["severity"] == "warning"
-        assert result.findings[0]["tool_source"] == "ai-claude"
+        assert result.findings[0].title == "Use type hints"
+        assert result.findings[0].severity == "warning"
+        assert result.findings[0].tool_source == "ai-claude"
 
-    @pytest.mark.asyncio
-    @patch("app.services.analysis.ai_reviewer.claude_service")
-    async def test_analyze_with_pr_context(self, mock_service):
+    async def test_analyze_with_pr_context(
+        self, mock_service, reviewer, sample_files, workspace
+    ):
         """Test analysis includes PR context."""
         mock_service.is_available.return_value = True
         mock_service.review_code = AsyncMock(return_value='{"findings": [], "summary": "OK"}')
 
-        reviewer = AIReviewer()
-        files = {"test.py": "x = 1"}
-        workspace = Path("/tmp/test")
         pr_context = {"title": "Fix bug", "description": "Fixes issue #123"}
 
-        result = await reviewer.analyze(files, workspace, pr_context)
+        result = await reviewer.analyze(sample_files, workspace, pr_context)
 
         # Verify PR context was passed
         mock_service.review_code.assert_called_once()
         call_args = mock_service.review_code.call_args
         assert call_args[1]["pr_context"] == pr_context
 
-    @pytest.mark.asyncio
-    @patch("app.services.analysis.ai_reviewer.claude_service")
-    async def test_analyze_handles_api_error(self, mock_service):
+    async def test_analyze_handles_api_error(
+        self, mock_service, reviewer, sample_files, workspace
+    ):
         """Test analysis handles API errors gracefully."""
         mock_service.is_available.return_value = True
         mock_service.review_code = AsyncMock(side_effect=Exception("API error"))
 
-        reviewer = AIReviewer()
-        files = {"test.py": "print('hello')"}
-        workspace = Path("/tmp/test")
-
-        result = await reviewer.analyze(files, workspace)
+        result = await reviewer.analyze(sample_files, workspace)
 
         assert result.success is False
         assert "AI review failed" in result.error
         assert len(result.findings) == 0
 
-    def test_truncate_files_small(self):
+    def test_truncate_files_small(self, reviewer):
         """Test file truncation with small files."""
-        reviewer = AIReviewer()
         files = {
             "file1.py": "a" * 100,
             "file2.py": "b" * 200,
@@ -224,9 +249,8 @@ class TestAIReviewer:
         assert "file2.py" in truncated
         assert "file3.py" in truncated
 
-    def test_truncate_files_large(self):
+    def test_truncate_files_large(self, reviewer):
         """Test file truncation with large files."""
-        reviewer = AIReviewer()
         files = {
             "small.py": "a" * 100,
             "medium.py": "b" * 1000,
@@ -242,158 +266,94 @@ class TestAIReviewer:
         total_size = sum(len(content) for content in truncated.values())
         assert total_size <= 2000
 
-    def test_parse_ai_response_json_in_markdown(self):
-        """Test parsing JSON response wrapped in markdown."""
-        reviewer = AIReviewer()
-        response = '''
-Here's my review:
-
-```json
-{
-  "findings": [
-    {
-      "category": "performance",
-      "severity": "critical",
-      "title": "Inefficient loop",
-      "description": "Loop can be optimized",
-      "file_path": "app.py",
-      "line_number": 42,
-      "suggestion": "Use list comprehension"
-    }
-  ],
-  "summary": "Needs optimization"
-}
-```
-        '''
-
-        findings = reviewer._parse_ai_response(response)
-
-        assert len(findings) == 1
-        assert findings[0]["title"] == "Inefficient loop"
-        assert findings[0]["severity"] == "critical"
-        assert findings[0]["category"] == "performance"
-
-    def test_parse_ai_response_plain_json(self):
-        """Test parsing plain JSON response."""
-        reviewer = AIReviewer()
-        response = '{"findings": [{"category": "testing", "severity": "info", "title": "Add tests"}], "summary": "OK"}'
-
+    def test_truncate_files_scales(self, reviewer):
+        """Test truncation stays fast and order-stable with many files."""
+        files = {f"f{i}.py": "x" * 100 for i in range(10_000)}
+
+        started = time.perf_counter()
+        truncated = reviewer._truncate_files(files, max_chars=500_000)
+        elapsed = time.perf_counter() - started
+
+        # Equal-sized files are taken in their original order
+        assert list(truncated) == [f"f{i}.py" for i in range(5_000)]
+        # Generous bound: only quadratic behaviour would come close
+        assert elapsed < 0.5
+
+    @pytest.mark.parametrize(
+        "response,expected",
+        [
+            # JSON wrapped in a markdown fence
+            (
+                load_ai_response("inefficient_loop.md"),
+                {
+                    "title": "Inefficient loop",
+                    "severity": "critical",
+                    "category": "performance",
+                },
+            ),
+            # Plain JSON
+            (
+                '{"findings": [{"category": "testing", "severity": "info", '
+                '"title": "Add tests"}], "summary": "OK"}',
+                {"title": "Add tests"},
+            ),
+            # No JSON: falls back to one generic finding from the text
+            (
+                TEXT_RESPONSE,
+                {
+                    "category": "ai-review",
+                    "severity": "info",
+                    "description": TEXT_RESPONSE,
+                },
+            ),
+            # Unknown severity falls back to info
+            (load_ai_response("invalid_severity.md"), {"severity": "info"}),
+        ],
+        ids=["json-in-markdown", "plain-json", "text-fallback", "invalid-severity"],
+    )
+    def test_parse_ai_response(self, reviewer, response, expected):
+        """Test AI responses are parsed into the expected single finding."""
         findings = reviewer._parse_ai_response(response)
 
         assert len(findings) == 1
-        assert findings[0]["title"] == "Add tests"
+        for field, value in expected.items():
+            assert getattr(findings[0], field) == value
 
-    def test_parse_ai_response_invalid_json(self):
-        """Test parsing invalid JSON falls back to text."""
-        reviewer = AIReviewer()
-        response = "This is just text feedback about the code"
-
-        findings = reviewer._parse_ai_response(response)
-
-        # Should create a generic finding from the text
-        assert len(findings) == 1
-        assert findings[0]["category"] == "ai-review"
-        assert findings[0]["severity"] == "info"
-        assert "text feedback" in findings[0]["description"]
-
-    def test_parse_ai_response_invalid_severity(self):
-        """Test parsing normalizes invalid severity values."""
-        reviewer = AIReviewer()
-        response = '''
-```json
-{
-  "findings": [
-    {
-      "category": "quality",
-      "severity": "SUPER_CRITICAL",
-      "title": "Bad code"
-    }
-  ]
-}
-```
-        '''
-
-        findings = reviewer._parse_ai_response(response)
-
-        assert len(findings) == 1
-        assert findings[0]["severity"] == "info"  # Falls back to info
-
-    def test_map_category(self):
+    def test_map_category(self, reviewer):
         """Test category mapping."""
-        reviewer = AIReviewer()
-
         assert reviewer._map_category("best-practices") == "best-practices"
         assert reviewer._map_category("design") == "design"
         assert reviewer._map_category("performance") == "performance"
         assert reviewer._map_category("unknown-category") == "ai-review"
         assert reviewer._map_category("SECURITY") == "security"  # Case insensitive
 
-    @pytest.mark.asyncio
-    @patch("app.services.analysis.ai_reviewer.claude_service")
-    async def test_analyze_empty_files(self, mock_service):
+    async def test_analyze_empty_files(self, mock_service, reviewer, workspace):
         """Test analysis with empty files dict."""
         mock_service.is_available.return_value = True
 
-        reviewer = AIReviewer()
-        files = {}
-        workspace = Path("/tmp/test")
-
-        result = await reviewer.analyze(files, workspace)
+        result = await reviewer.analyze({}, workspace)
 
         assert result.success is True
         assert len(result.findings) == 0
         # Should not call API with empty files
         mock_service.review_code.assert_not_called()
 
-    @pytest.mark.asyncio
-    @patch("app.services.analysis.ai_reviewer.claude_service")
-    async def test_analyze_multiple_findings(self, mock_service):
+    async def test_analyze_multiple_findings(
+        self, mock_service, reviewer, sample_files, workspace
+    ):
         """Test analysis with multiple findings."""
         mock_service.is_available.return_value = True
-        mock_service.review_code = AsyncMock(return_value='''
-```json
-{
-  "findings": [
-    {
-      "category": "security",
-      "severity": "critical",
-      "title": "SQL Injection",
-      "description": "Unsafe query",
-      "file_path": "db.py",
-      "line_number": 10
-    },
-    {
-      "category": "best-practices",
-      "severity": "warning",
-      "title": "Use constants",
-      "description": "Magic numbers",
-      "file_path": "config.py",
-      "line_number": 5
-    },
-    {
-      "category": "testing",
-      "severity": "info",
-      "title": "Add unit tests",
-      "description": "No tests found",
-      "file_path": "service.py"
-    }
-  ],
-  "summary": "Multiple issues found"
-}
-```
-        ''')
-
-        reviewer = AIReviewer()
-        files = {"test.py": "code"}
-        workspace = Path("/tmp/test")
-
-        result = await reviewer.analyze(files, workspace)
+        mock_service.review_code = AsyncMock(
+            return_value=load_ai_response("multiple_findings.md")
+        )
+
+        result = await reviewer.analyze(sample_files, workspace)
 
         assert result.success is True
         assert len(result.findings) == 3
 
         # Verify findings are properly parsed
-        severities = [f["severity"] for f in result.findings]
+        severities = [f.severity for f in result.findings]
         assert "critical" in severities
         assert "warning" in severities
         assert "info" in severities
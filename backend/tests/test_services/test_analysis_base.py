@@ -0,0 +1,75 @@
+"""
+Tests for shared analyzer utilities.
+"""
+
+import pytest
+from app.services.analysis.base import (
+    extract_python_files_from_diff,
+    extract_python_files_from_diff_stream,
+    is_test_file,
+)
+
+
+# None of these tests touch the database
+pytestmark = pytest.mark.unit
+
+
+SAMPLE_DIFF = """diff --git a/app.py b/app.py
+--- a/app.py
++++ b/app.py
+@@ -0,0 +1,2 @@
++name = "café"
++print(name)
+diff --git a/README.md b/README.md
++docs
+diff --git a/pkg/__init__.py b/pkg/__init__.py
++
+diff --git a/pkg/util.py b/pkg/util.py
++def helper():
++    return 1"""
+
+
+async def chunked(data: bytes, size: int):
+    """Yield data in fixed-size chunks, splitting lines and characters."""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+class TestExtractPythonFiles:
+    """Tests for pulling Python files out of a diff."""
+
+    def test_extract_from_string(self):
+        """Test only non-blank additions to Python files are kept."""
+        files = extract_python_files_from_diff(SAMPLE_DIFF)
+
+        assert files == {
+            "app.py": 'name = "café"\nprint(name)',
+            "pkg/util.py": "def helper():\n    return 1",
+        }
+
+    @pytest.mark.parametrize("size", [1, 5, 4096])
+    async def test_stream_matches_string(self, size):
+        """Test streamed parsing matches the string parser for any chunking."""
+        files = await extract_python_files_from_diff_stream(
+            chunked(SAMPLE_DIFF.encode("utf-8"), size)
+        )
+
+        assert files == extract_python_files_from_diff(SAMPLE_DIFF)
+
+
+class TestIsTestFile:
+    """Tests for recognising test modules."""
+
+    @pytest.mark.parametrize(
+        "filepath,expected",
+        [
+            ("tests/helpers.py", True),
+            ("pkg/test_views.py", True),
+            ("pkg/views_test.py", True),
+            ("pkg/views.py", False),
+            ("pkg/testing.py", False),
+        ],
+    )
+    def test_is_test_file(self, filepath, expected):
+        """Test test modules are told apart from source modules."""
+        assert is_test_file(filepath) is expected
@@ -0,0 +1,255 @@
+"""
+Tests for GitHub API service.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import time
+from contextlib import aclosing
+import httpx
+import pytest
+from fastapi import HTTPException
+from app.services.github_service import GitHubService
+
+
+# None of these tests touch the database
+pytestmark = pytest.mark.unit
+
+
+def make_service(handler) -> GitHubService:
+    """Create a GitHub service whose shared client uses a mock transport."""
+    service = GitHubService()
+    service._client = httpx.AsyncClient(
+        base_url=service.api_base_url,
+        transport=httpx.MockTransport(handler),
+    )
+    return service
+
+
+class TestConditionalRequests:
+    """Tests for ETag-based conditional GETs."""
+
+    async def test_not_modified_served_from_cache(self):
+        """Test a 304 reply returns the body cached from the earlier 200."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"id": 1}, headers={"ETag": '"v1"'})
+
+        service = make_service(handler)
+
+        first = await service.get_repository("token", "owner", "repo")
+        second = await service.get_repository("token", "owner", "repo")
+
+        assert first == second == {"id": 1}
+        assert "If-None-Match" not in requests[0].headers
+        assert requests[1].headers["If-None-Match"] == '"v1"'
+
+    async def test_cache_is_keyed_by_token(self):
+        """Test cached responses are not shared between access tokens."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=[], headers={"ETag": '"v1"'})
+
+        service = make_service(handler)
+
+        await service.get_user_repositories("token-a")
+        await service.get_user_repositories("token-b")
+
+        assert "If-None-Match" not in requests[1].headers
+
+    async def test_last_modified_fallback(self):
+        """Test If-Modified-Since is sent when only Last-Modified was returned."""
+        last_modified = "Wed, 01 May 2024 12:00:00 GMT"
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.headers.get("If-Modified-Since") == last_modified:
+                return httpx.Response(304)
+            return httpx.Response(
+                200, json=[{"number": 1}], headers={"Last-Modified": last_modified}
+            )
+
+        service = make_service(handler)
+
+        first = await service.get_pull_requests("token", "owner", "repo")
+        second = await service.get_pull_requests("token", "owner", "repo")
+
+        assert first == second == [{"number": 1}]
+        assert "If-None-Match" not in requests[1].headers
+
+    async def test_error_status_not_cached(self):
+        """Test error responses still raise and are not cached."""
+        def handler(request):
+            return httpx.Response(404)
+
+        service = make_service(handler)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.get_repository("token", "owner", "missing")
+
+        assert exc_info.value.status_code == 404
+        assert len(service._etag_cache) == 0
+
+
+class TestRateLimiting:
+    """Tests for rate-limit handling in GitHub requests."""
+
+    async def test_rate_limited_request_is_retried(self):
+        """Test a 429 with Retry-After is retried and then succeeds."""
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "0"}),
+            httpx.Response(200, json={"login": "octocat"}),
+        ]
+
+        def handler(request):
+            return responses.pop(0)
+
+        service = make_service(handler)
+
+        user = await service.get_user_info("token")
+
+        assert user == {"login": "octocat"}
+        assert responses == []
+
+    async def test_permission_403_not_retried(self):
+        """Test a 403 without rate-limit headers fails immediately."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(403)
+
+        service = make_service(handler)
+
+        with pytest.raises(HTTPException):
+            await service.get_repository("token", "owner", "private")
+
+        assert len(requests) == 1
+
+    async def test_low_remaining_gates_next_request(self):
+        """Test a nearly exhausted quota delays only that token's requests."""
+        reset_at = str(int(time.time()) + 30)
+
+        def handler(request):
+            if request.headers["Authorization"] == "Bearer other-token":
+                return httpx.Response(200, json={})
+            return httpx.Response(
+                200,
+                json={},
+                headers={"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": reset_at},
+            )
+
+        service = make_service(handler)
+
+        await service.get_user_info("token")
+        resume_at = service._rl_resume_at[service._token_key("token")]
+        assert resume_at > time.monotonic() + 20
+
+        # Another user's token has its own quota and is not held back
+        await asyncio.wait_for(service.get_user_info("other-token"), timeout=1)
+        assert service._token_key("other-token") not in service._rl_resume_at
+
+
+class TestDiffStreaming:
+    """Tests for streaming PR diffs."""
+
+    async def test_iter_pull_request_diff_yields_body(self):
+        """Test streamed chunks reassemble into the full diff."""
+        body = b"diff --git a/app.py b/app.py\n" * 5000
+
+        def handler(request):
+            assert request.headers["Accept"] == "application/vnd.github.v3.diff"
+            return httpx.Response(200, content=body)
+
+        service = make_service(handler)
+
+        chunks = [
+            chunk
+            async for chunk in service.iter_pull_request_diff(
+                "token", "owner", "repo", 1
+            )
+        ]
+
+        assert b"".join(chunks) == body
+        assert await service.get_pull_request_diff(
+            "token", "owner", "repo", 1
+        ) == body.decode()
+
+    async def test_iter_pull_request_diff_error(self):
+        """Test a failed diff request raises the upstream status before yielding."""
+        def handler(request):
+            return httpx.Response(404)
+
+        service = make_service(handler)
+
+        with pytest.raises(HTTPException) as exc_info:
+            async for _ in service.iter_pull_request_diff("token", "owner", "repo", 1):
+                pass
+
+        assert exc_info.value.status_code == 404
+
+    async def test_iter_pull_request_diff_releases_slot(self):
+        """Test the concurrency slot is free while the consumer reads the body."""
+        def handler(request):
+            return httpx.Response(200, content=b"diff --git a/app.py b/app.py\n")
+
+        service = make_service(handler)
+        service._rl_semaphore = asyncio.Semaphore(1)
+
+        async with aclosing(
+            service.iter_pull_request_diff("token", "owner", "repo", 1)
+        ) as stream:
+            await stream.__anext__()
+            assert not service._rl_semaphore.locked()
+
+
+class TestWebhookSignature:
+    """Tests for webhook signature verification."""
+
+    @staticmethod
+    def sign(service, payload):
+        """Compute the X-Hub-Signature-256 header GitHub would send."""
+        digest = hmac.new(
+            service.webhook_secret.encode("utf-8"), payload, hashlib.sha256
+        ).hexdigest()
+        return f"sha256={digest}"
+
+    def test_valid_signature(self):
+        """Test a correctly signed payload is accepted."""
+        service = GitHubService()
+        payload = b'{"action": "opened"}'
+
+        assert service.verify_webhook_signature(payload, self.sign(service, payload))
+
+    def test_tampered_payload_rejected(self):
+        """Test a signature for a different payload is rejected."""
+        service = GitHubService()
+        signature = self.sign(service, b'{"action": "opened"}')
+
+        assert not service.verify_webhook_signature(b'{"action": "closed"}', signature)
+
+    @pytest.mark.parametrize(
+        "signature",
+        [
+            "",
+            "sha1=abc",
+            "sha256=not-hex",
+            "sha256=abcd",
+            "sha256=" + "a" * 63,
+            "sha256=" + "z" * 64,
+            "sha256=" + "\u00e9" * 64,
+        ],
+    )
+    def test_malformed_signature_rejected(self, signature):
+        """Test missing, wrong-algorithm and malformed signatures are rejected."""
+        service = GitHubService()
+
+        assert not service.verify_webhook_signature(b"{}", signature)
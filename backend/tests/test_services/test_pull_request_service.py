@@ -0,0 +1,239 @@
+"""
+Tests for pull request service.
+"""
+
+import asyncio
+import threading
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from app.models.pull_request import PullRequest
+from app.models.repository import Repository
+from app.services.pull_request_service import (
+    KNOWN_REPOS_REFRESH_SECONDS,
+    PullRequestService,
+    pull_request_service,
+)
+
+
+@pytest.fixture
+def repository(db_session, test_user):
+    """Create a monitored repository with one stored PR."""
+    repo = Repository(
+        user_id=test_user.id,
+        github_id=99999,
+        name="test-repo",
+        full_name="testuser/test-repo",
+        owner="testuser",
+    )
+    db_session.add(repo)
+    db_session.flush()
+
+    db_session.add(
+        PullRequest(repository_id=repo.id, pr_number=1, title="Existing PR")
+    )
+    db_session.flush()
+    return repo
+
+
+class TestRepositoryAndPrLookup:
+    """Tests for the combined repository/PR lookup used by webhooks."""
+
+    @staticmethod
+    def make_payload(repo_github_id, number):
+        """Build the minimal webhook payload the lookup reads."""
+        return SimpleNamespace(
+            number=number, repository=SimpleNamespace(id=repo_github_id)
+        )
+
+    def test_finds_repository_and_pr(self, db_session, repository):
+        """Test an existing PR is returned alongside its repository."""
+        repo, pr = pull_request_service._find_repository_and_pr(
+            self.make_payload(99999, 1), db_session
+        )
+
+        assert repo.id == repository.id
+        assert pr.title == "Existing PR"
+
+    def test_missing_pr_returns_repository_only(self, db_session, repository):
+        """Test an unknown PR number still returns the repository."""
+        repo, pr = pull_request_service._find_repository_and_pr(
+            self.make_payload(99999, 2), db_session
+        )
+
+        assert repo.id == repository.id
+        assert pr is None
+
+    def test_unknown_repository(self, db_session, repository):
+        """Test an unmonitored repository returns nothing."""
+        repo, pr = pull_request_service._find_repository_and_pr(
+            self.make_payload(11111, 1), db_session
+        )
+
+        assert repo is None
+        assert pr is None
+
+
+class TestPullRequestUpsert:
+    """Tests for storing PRs from webhook payloads."""
+
+    @staticmethod
+    def make_payload(number, title):
+        """Build the webhook payload fields the upsert reads."""
+        return SimpleNamespace(
+            number=number,
+            pull_request=SimpleNamespace(
+                title=title,
+                body="Description",
+                user={"login": "octocat"},
+                state="open",
+                base={"ref": "main"},
+                head={"ref": "feature"},
+                changed_files=2,
+                additions=10,
+                deletions=3,
+                html_url="https://github.com/testuser/test-repo/pull/1",
+            ),
+        )
+
+    def test_upsert_creates_new_pr(self, db_session, repository):
+        """Test a new PR number inserts a row."""
+        pr = pull_request_service._upsert_pull_request(
+            repository, self.make_payload(2, "New PR"), db_session
+        )
+        db_session.commit()
+
+        assert pr.id is not None
+        assert pr.pr_number == 2
+        assert pr.author == "octocat"
+        assert repository.pull_requests.count() == 2
+
+    def test_upsert_updates_existing_pr(self, db_session, repository):
+        """Test an existing PR number updates the stored row in place."""
+        existing = repository.pull_requests.filter_by(pr_number=1).one()
+
+        pr = pull_request_service._upsert_pull_request(
+            repository, self.make_payload(1, "Renamed PR"), db_session
+        )
+        db_session.commit()
+
+        assert pr.id == existing.id
+        assert pr.title == "Renamed PR"
+        assert pr.head_branch == "feature"
+        assert repository.pull_requests.count() == 1
+
+    def test_upsert_falls_back_without_on_conflict(self, db_session, repository):
+        """Test dialects without an ON CONFLICT insert still create and update."""
+        existing = repository.pull_requests.filter_by(pr_number=1).one()
+
+        with patch.dict(
+            "app.services.pull_request_service.UPSERT_INSERTS", clear=True
+        ):
+            updated = pull_request_service._upsert_pull_request(
+                repository, self.make_payload(1, "Renamed PR"), db_session
+            )
+            created = pull_request_service._upsert_pull_request(
+                repository, self.make_payload(2, "New PR"), db_session
+            )
+        db_session.commit()
+
+        assert updated.id == existing.id
+        assert updated.title == "Renamed PR"
+        assert created.pr_number == 2
+        assert repository.pull_requests.count() == 2
+
+
+class TestWebhookProcessing:
+    """Tests for webhook event handlers."""
+
+    async def test_process_pr_closed_marks_merged(self, db_session, repository):
+        """Test a merged PR close event updates the stored state."""
+        payload = SimpleNamespace(
+            number=1,
+            repository=SimpleNamespace(id=99999, full_name="testuser/test-repo"),
+            pull_request=SimpleNamespace(merged_at="2024-01-01T00:00:00Z"),
+        )
+
+        pr = await pull_request_service.process_pr_closed(payload, db_session)
+
+        assert pr.state == "merged"
+
+    async def test_unknown_repository_skipped(self, db_session, repository):
+        """Test events for unmonitored repositories are ignored."""
+        payload = SimpleNamespace(
+            number=1,
+            repository=SimpleNamespace(id=11111, full_name="someone/else"),
+        )
+
+        assert await pull_request_service.process_pr_opened(payload, db_session) is None
+
+
+class TestKnownRepositories:
+    """Tests for the in-memory set of monitored repositories."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a fresh service so the shared instance is untouched."""
+        return PullRequestService()
+
+    async def test_unloaded_set_allows_everything(self, db_session, service):
+        """Test all repositories pass until the set is loaded."""
+        assert await service._is_known_repository(11111, db_session)
+
+    async def test_unknown_repository_dropped_without_lookup(
+        self, db_session, repository, service
+    ):
+        """Test events for unmonitored repositories skip the database."""
+        service.load_known_repositories(db_session)
+        payload = SimpleNamespace(
+            number=1,
+            repository=SimpleNamespace(id=11111, full_name="someone/else"),
+        )
+
+        with patch.object(service, "_find_repository_and_pr") as mock_find:
+            assert await service.process_pr_opened(payload, db_session) is None
+
+        mock_find.assert_not_called()
+
+    async def test_set_tracks_added_and_removed(self, db_session, repository, service):
+        """Test repositories added or removed are reflected immediately."""
+        service.load_known_repositories(db_session)
+
+        assert await service._is_known_repository(99999, db_session)
+
+        service.add_known_repository(22222)
+        service.discard_known_repository(99999)
+
+        assert await service._is_known_repository(22222, db_session)
+        assert not await service._is_known_repository(99999, db_session)
+
+    async def test_reload_keeps_changes_made_while_querying(
+        self, db_session, repository, service
+    ):
+        """Test a reload replays concurrent changes and runs only once."""
+        service.load_known_repositories(db_session)
+        service._known_repos_loaded_at -= KNOWN_REPOS_REFRESH_SECONDS + 1
+        started, release = threading.Event(), threading.Event()
+
+        def slow_select(db):
+            started.set()
+            release.wait(5)
+            return {99999}
+
+        with patch.object(
+            service, "_select_known_repositories", side_effect=slow_select
+        ) as mock_select:
+            reload = asyncio.create_task(
+                service._is_known_repository(22222, db_session)
+            )
+            await asyncio.to_thread(started.wait, 5)
+
+            service.add_known_repository(22222)
+            service.discard_known_repository(99999)
+            assert await service._is_known_repository(22222, db_session)
+
+            release.set()
+            assert await reload
+
+        mock_select.assert_called_once()
+        assert not await service._is_known_repository(99999, db_session)
@@ -0,0 +1,334 @@
+"""
+Tests for review orchestration service.
+"""
+
+import asyncio
+from collections import Counter
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy.orm import sessionmaker
+from app.models.repository import Repository
+from app.models.pull_request import PullRequest
+from app.models.review import Review
+from app.models.finding import Finding
+from app.services.analysis.base import AnalyzerFinding, AnalyzerResult
+from app.services.review_service import (
+    CLEAN_SUMMARY,
+    NO_PYTHON_FILES_SUMMARY,
+    SHUTDOWN_SUMMARY,
+    SMALL_CHANGE_MAX_LINES,
+    ReviewService,
+)
+
+
+SAMPLE_DIFF = """diff --git a/app.py b/app.py
+--- a/app.py
++++ b/app.py
+@@ -0,0 +1,2 @@
++import os
++os.system(user_input)
+"""
+
+
+@pytest.fixture
+def pending_review(db_session, test_user):
+    """Create a repository, pull request and pending review."""
+    repo = Repository(
+        user_id=test_user.id,
+        github_id=99999,
+        name="test-repo",
+        full_name="testuser/test-repo",
+        owner="testuser",
+    )
+    db_session.add(repo)
+    db_session.flush()
+
+    pr = PullRequest(repository_id=repo.id, pr_number=1, title="Test PR")
+    db_session.add(pr)
+    db_session.flush()
+
+    review = Review(
+        pull_request_id=pr.id,
+        status="pending",
+        critical_count=0,
+        warning_count=0,
+        info_count=0,
+    )
+    db_session.add(review)
+    db_session.flush()
+    return review, pr
+
+
+def analyzer_result(tool, *severities):
+    """Build an analyzer result with one finding per severity."""
+    return AnalyzerResult(
+        tool=tool,
+        findings=[
+            AnalyzerFinding(
+                category=tool,
+                severity=severity,
+                title=f"{tool} {severity}",
+                file_path="app.py",
+                line_number=2,
+                tool_source=tool,
+            )
+            for severity in severities
+        ],
+    )
+
+
+@pytest.fixture
+def service(db_connection):
+    """Create a review service whose background sessions use the test DB."""
+    return ReviewService(
+        session_factory=sessionmaker(
+            bind=db_connection, join_transaction_mode="create_savepoint"
+        )
+    )
+
+
+async def run_analysis(service, db_session, review, pr, user):
+    """Run the pipeline for a review and reload it from the test session."""
+    await service._run_analysis(review.id, pr.id, user.id)
+    db_session.expire_all()
+
+
+def diff_stream(diff):
+    """Build a stand-in for iter_pr_diff that streams a diff in small chunks."""
+
+    async def iter_pr_diff(*args):
+        body = diff.encode("utf-8")
+        for start in range(0, len(body), 7):
+            yield body[start:start + 7]
+
+    return iter_pr_diff
+
+
+@pytest.fixture
+def mock_analyzers():
+    """Patch the diff fetch and all analyzers with canned results."""
+    with patch(
+        "app.services.review_service.pull_request_service.iter_pr_diff",
+        diff_stream(SAMPLE_DIFF),
+    ), patch(
+        "app.services.review_service.security_analyzer.analyze",
+        AsyncMock(return_value=analyzer_result("security", "critical")),
+    ), patch(
+        "app.services.review_service.quality_analyzer.analyze",
+        AsyncMock(return_value=analyzer_result("quality", "warning", "info")),
+    ), patch(
+        "app.services.review_service.complexity_analyzer.analyze",
+        AsyncMock(return_value=analyzer_result("complexity", "info")),
+    ), patch(
+        "app.services.review_service.ai_reviewer.analyze",
+        AsyncMock(return_value=analyzer_result("ai_suggestion")),
+    ):
+        yield
+
+
+class TestRunAnalysis:
+    """Tests for the background analysis pipeline."""
+
+    async def test_findings_stored_and_counted(
+        self, service, db_session, test_user, pending_review, mock_analyzers
+    ):
+        """Test all analyzer findings are stored and severities tallied."""
+        review, pr = pending_review
+
+        await run_analysis(service, db_session, review, pr, test_user)
+
+        assert review.status == "completed"
+        assert review.critical_count == 1
+        assert review.warning_count == 1
+        assert review.info_count == 2
+        assert db_session.query(Finding).filter_by(review_id=review.id).count() == 4
+
+    async def test_marked_in_progress_while_running(
+        self, service, db_session, test_user, pending_review
+    ):
+        """Test the review is in_progress with started_at set during analysis."""
+        review, pr = pending_review
+        seen = {}
+
+        async def iter_pr_diff(*args):
+            with service._session_factory() as db:
+                running = db.get(Review, review.id)
+                seen["status"] = running.status
+                seen["started_at"] = running.started_at
+            yield b""
+
+        with patch(
+            "app.services.review_service.pull_request_service.iter_pr_diff",
+            iter_pr_diff,
+        ):
+            await run_analysis(service, db_session, review, pr, test_user)
+
+        assert seen["status"] == "in_progress"
+        assert seen["started_at"] is not None
+        assert review.status == "completed"
+        assert review.started_at == seen["started_at"]
+
+    async def test_no_python_files(
+        self, service, db_session, test_user, pending_review
+    ):
+        """Test a diff without Python files completes with a clean score."""
+        review, pr = pending_review
+
+        with patch(
+            "app.services.review_service.pull_request_service.iter_pr_diff",
+            diff_stream("diff --git a/README.md b/README.md\n+hello"),
+        ):
+            await run_analysis(service, db_session, review, pr, test_user)
+
+        assert review.status == "completed"
+        assert review.overall_score == 100
+        assert review.summary == NO_PYTHON_FILES_SUMMARY
+        assert db_session.query(Finding).count() == 0
+
+    async def test_failure_discards_partial_findings(
+        self, service, db_session, test_user, pending_review, mock_analyzers
+    ):
+        """Test a failure leaves the review failed with no findings stored."""
+        review, pr = pending_review
+
+        with patch.object(
+            service, "_generate_summary", side_effect=RuntimeError("boom")
+        ):
+            await run_analysis(service, db_session, review, pr, test_user)
+
+        assert review.status == "failed"
+        assert "boom" in review.summary
+        assert db_session.query(Finding).count() == 0
+
+
+class TestReviewQueue:
+    """Tests for the bounded review worker pool."""
+
+    async def test_queued_reviews_run_on_workers(
+        self, service, db_session, test_user, pending_review
+    ):
+        """Test create_review hands analysis to the worker pool."""
+        _, pr = pending_review
+        await service.startup(num_workers=2)
+
+        try:
+            with patch.object(service, "_run_analysis", AsyncMock()) as mock_run:
+                review = await service.create_review(pr, test_user, db_session)
+                await service._queue.join()
+
+            mock_run.assert_awaited_once_with(review.id, pr.id, test_user.id)
+        finally:
+            await service.shutdown()
+
+        assert service._workers == []
+
+    async def test_shutdown_fails_running_and_queued_reviews(
+        self, service, db_session, test_user, pending_review
+    ):
+        """Test shutdown leaves no review pending or in progress."""
+        _, pr = pending_review
+        streaming = asyncio.Event()
+
+        async def iter_pr_diff(*args):
+            streaming.set()
+            await asyncio.sleep(60)
+            yield b""
+
+        await service.startup(num_workers=1)
+        with patch(
+            "app.services.review_service.pull_request_service.iter_pr_diff",
+            iter_pr_diff,
+        ):
+            running = await service.create_review(pr, test_user, db_session)
+            queued = await service.create_review(pr, test_user, db_session)
+            await asyncio.wait_for(streaming.wait(), timeout=5)
+
+            await service.shutdown()
+
+        db_session.expire_all()
+        assert running.status == "failed"
+        assert running.started_at is not None
+        assert running.summary == SHUTDOWN_SUMMARY
+        assert queued.status == "failed"
+        assert queued.started_at is None
+        assert queued.summary == SHUTDOWN_SUMMARY
+
+
+class TestRunAnalyzers:
+    """Tests for concurrent analyzer execution."""
+
+    async def test_failure_cancels_siblings(self, service):
+        """Test an analyzer error cancels analyzers still running."""
+        cancelled = asyncio.Event()
+
+        async def slow_analyze(*args):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with patch(
+            "app.services.review_service.security_analyzer.analyze", slow_analyze
+        ), patch(
+            "app.services.review_service.quality_analyzer.analyze",
+            AsyncMock(side_effect=RuntimeError("pylint crashed")),
+        ), patch(
+            "app.services.review_service.complexity_analyzer.analyze", slow_analyze
+        ), patch(
+            "app.services.review_service.ai_reviewer.analyze", slow_analyze
+        ):
+            with pytest.raises(RuntimeError, match="pylint crashed"):
+                await asyncio.wait_for(
+                    service._run_analyzers({"app.py": ""}, None, {}), timeout=5
+                )
+
+        assert cancelled.is_set()
+
+    @pytest.mark.parametrize(
+        "line_count,expected_files",
+        [(3, []), (SMALL_CHANGE_MAX_LINES, ["app.py"])],
+    )
+    async def test_small_change_skips_complexity(
+        self, service, line_count, expected_files
+    ):
+        """Test complexity only runs on changes of a meaningful size."""
+        python_files = {
+            "app.py": "\n".join(["x = 1"] * line_count),
+            "tests/test_app.py": "",
+        }
+        complexity = AsyncMock(return_value=analyzer_result("complexity"))
+
+        with patch(
+            "app.services.review_service.security_analyzer.analyze",
+            AsyncMock(return_value=analyzer_result("security")),
+        ), patch(
+            "app.services.review_service.quality_analyzer.analyze",
+            AsyncMock(return_value=analyzer_result("quality")),
+        ), patch(
+            "app.services.review_service.complexity_analyzer.analyze", complexity
+        ), patch(
+            "app.services.review_service.ai_reviewer.analyze",
+            AsyncMock(return_value=analyzer_result("ai_suggestion")),
+        ):
+            await service._run_analyzers(python_files, None, {})
+
+        assert list(complexity.await_args.args[0]) == expected_files
+
+
+class TestGenerateSummary:
+    """Tests for review summary text."""
+
+    def test_categories_sorted_by_count(self, service):
+        """Test the category breakdown lists the most common first."""
+        summary = service._generate_summary(
+            1, 0, 2, Counter({"quality": 1, "security": 2})
+        )
+
+        assert "Found 3 issue(s)" in summary
+        assert summary.index("- security: 2") < summary.index("- quality: 1")
+        assert "Critical issues found" in summary
+
+    def test_clean_summary(self, service):
+        """Test a review without findings gets the fixed clean summary."""
+        assert service._generate_summary(0, 0, 0, Counter()) is CLEAN_SUMMARY